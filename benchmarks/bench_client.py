@@ -0,0 +1,146 @@
+import asyncio
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+
+import repltalk
+from benchmarks import fixtures
+from benchmarks.server import FakeServer
+
+# Measures the main entry points of the client against a local fake server,
+# so it works without the network: how many calls and requests it does per
+# second, how long each call takes, how long making the objects from an
+# already decoded response takes, and how much memory a call needs at most.
+# Run with: python -m benchmarks.bench_client [directory of recorded responses]
+
+
+async def get_posts(client, post):
+	return [p async for p in client.boards.all.get_posts(sort='new', limit=30)]
+
+
+async def get_post(client, post):
+	return await client.get_post(1)
+
+
+async def get_comments(client, post):
+	return await post.get_comments()
+
+
+async def get_all_comments(client, post):
+	return await client.get_all_comments()
+
+
+async def get_leaderboard(client, post):
+	return await client.get_leaderboard(30)
+
+
+async def get_reports(client, post):
+	return await client.get_reports()
+
+
+entry_points = {
+	'get_posts': get_posts,
+	'get_post': get_post,
+	'get_comments': get_comments,
+	'get_all_comments': get_all_comments,
+	'get_leaderboard': get_leaderboard,
+	'get_reports': get_reports,
+}
+
+
+def builders(client, responses, post):
+	# Makes the objects for each entry point from its decoded response
+	def data(name):
+		return next(iter(responses[name]['data'].values()))
+
+	feed = data('ReplPostsFeed')['items']
+	post_data = data('post')
+	comments = data('postComments')['comments']['items']
+	all_comments = data('comments')['items']
+	leaderboard = data('leaderboard')['items']
+	reports = data('boardReports')
+	return {
+		'get_posts': lambda: [repltalk.get_post_object(client, p) for p in feed],
+		'get_post': lambda: repltalk.get_post_object(client, post_data),
+		'get_comments': lambda: [
+			repltalk.get_comment_object(client, c, post) for c in comments
+		],
+		'get_all_comments': lambda: [
+			repltalk.get_comment_object(client, c, repltalk.LazyPost(client, c['post']))
+			for c in all_comments
+		],
+		'get_leaderboard': lambda: [
+			repltalk.get_user_object(client, u) for u in leaderboard
+		],
+		'get_reports': lambda: repltalk.ReportList(client, reports),
+	}
+
+
+async def measure_latency(client, post, entry_point, number):
+	times = []
+	for _ in range(number):
+		start = time.perf_counter()
+		await entry_point(client, post)
+		times.append(time.perf_counter() - start)
+	return statistics.median(times), statistics.quantiles(times, n=100)[98]
+
+
+async def measure_throughput(client, post, entry_point, number, concurrency, server):
+	remaining = number
+
+	async def worker():
+		nonlocal remaining
+		while remaining > 0:
+			remaining -= 1
+			await entry_point(client, post)
+
+	requests = server.requests
+	start = time.perf_counter()
+	await asyncio.gather(*(worker() for _ in range(concurrency)))
+	elapsed = time.perf_counter() - start
+	return number / elapsed, (server.requests - requests) / elapsed
+
+
+async def measure_peak_memory(client, post, entry_point):
+	# The first call warms up anything that's only made once
+	await entry_point(client, post)
+	tracemalloc.start()
+	await entry_point(client, post)
+	current, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return peak
+
+
+async def run(number=200, concurrency=16, directory=None):
+	responses = fixtures.load(directory)
+	async with FakeServer(responses) as server:
+		repltalk.base_url = server.url
+		async with repltalk.Client() as client:
+			post = repltalk.get_post_object(client, responses['post']['data']['post'])
+			build = builders(client, responses, post)
+			print(
+				f'{"entry point":<17}{"calls/s":>9}{"requests/s":>12}{"p50 (ms)":>10}'
+				f'{"p99 (ms)":>10}{"build (us)":>12}{"peak (KiB)":>12}'
+			)
+			for name, entry_point in entry_points.items():
+				p50, p99 = await measure_latency(client, post, entry_point, number)
+				calls, requests = await measure_throughput(
+					client, post, entry_point, number, concurrency, server
+				)
+				build_time = min(timeit.repeat(build[name], number=20, repeat=5)) / 20
+				peak = await measure_peak_memory(client, post, entry_point)
+				print(
+					f'{name:<17}{calls:>9.0f}{requests:>12.0f}{p50 * 1e3:>10.2f}'
+					f'{p99 * 1e3:>10.2f}{build_time * 1e6:>12.1f}{peak / 1024:>12.1f}'
+				)
+
+
+def main():
+	directory = sys.argv[1] if len(sys.argv) > 1 else None
+	asyncio.run(run(directory=directory))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,58 @@
+import importlib
+import json
+import random
+import sys
+import timeit
+
+from benchmarks import fixtures
+
+# Compares how long the installed JSON decoders take on feed pages and
+# posts, run with: python -m benchmarks.bench_decode [directory of
+# recorded responses]
+
+
+def decoders():
+	found = {'json': json.loads}
+	for name in ('ujson', 'orjson'):
+		try:
+			found[name] = importlib.import_module(name).loads
+		except ImportError:
+			pass
+	return found
+
+
+def bodies(directory=None):
+	responses = fixtures.load(directory)
+	rng = random.Random(1)
+	# A feed page where every post has its votes and comments, like
+	# get_posts gets with the full post_attributes
+	full_feed = {'data': {'replPosts': fixtures.connection(
+		[fixtures.post(rng, 2000 + i, votes=100, comments=10) for i in range(30)],
+		next_cursor='30'
+	)}}
+	return {
+		'feed page': json.dumps(responses['ReplPostsFeed']).encode(),
+		'full feed page': json.dumps(full_feed).encode(),
+		'post': json.dumps(responses['post']).encode(),
+		'leaderboard': json.dumps(responses['leaderboard']).encode(),
+	}
+
+
+def main(number=20):
+	directory = sys.argv[1] if len(sys.argv) > 1 else None
+	found = decoders()
+	print(f'{"response":<16}{"size (KiB)":>12}' + ''.join(
+		f'{name + " (ms)":>14}' for name in found
+	))
+	for name, body in bodies(directory).items():
+		times = [
+			min(timeit.repeat(lambda: loads(body), number=number, repeat=5)) / number
+			for loads in found.values()
+		]
+		print(f'{name:<16}{len(body) / 1024:>12.1f}' + ''.join(
+			f'{t * 1e3:>14.3f}' for t in times
+		))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,42 @@
+import timeit
+import tracemalloc
+
+from repltalk import graphql
+from repltalk.queries import Queries
+
+# Measures how long rendering every query in Queries takes and how much it
+# allocates, run with: python -m benchmarks.bench_graphql
+
+queries = {
+	name: value for name, value in vars(Queries).items()
+	if isinstance(value, (graphql.Query, graphql.Mutation, graphql.Field))
+}
+
+
+def render_all():
+	for query in queries.values():
+		str(query)
+
+
+def measure_allocations():
+	tracemalloc.start()
+	render_all()
+	current, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return peak
+
+
+def main(number=200):
+	render_time = min(timeit.repeat(render_all, number=number, repeat=5)) / number
+	peak = measure_allocations()
+	print(f'rendered {len(queries)} queries')
+	print(f'render time:     {render_time * 1e6:.1f} us')
+	print(f'peak allocated:  {peak / 1024:.1f} KiB')
+	for name in ('get_post', 'posts_feed', 'get_comments'):
+		query = queries[name]
+		per_call = min(timeit.repeat(lambda: str(query), number=number, repeat=5)) / number
+		print(f'{name + ":":<17}{per_call * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,50 @@
+import json
+import timeit
+
+from repltalk import graphql
+from repltalk.queries import Queries
+
+# Compares rendering a query for every request with reusing the
+# compiled document, run with: python -m benchmarks.bench_queries
+
+queries = {
+	'get_post': Queries.get_post,
+	'posts_feed': Queries.posts_feed,
+	'get_comments': Queries.get_comments,
+	'get_user': Queries.get_user,
+	'get_reports': Queries.get_reports,
+}
+
+
+def render_payload(query):
+	return json.dumps({
+		'operationName': 'post',
+		'query': str(query),
+		'variables': {'id': 5599}
+	}).encode()
+
+
+def compiled_payload(query):
+	compiled = graphql.compile_query(query)
+	return b''.join((
+		b'{"operationName":', json.dumps('post').encode(),
+		b',"query":', compiled.encoded,
+		b',"variables":', json.dumps({'id': 5599}).encode(),
+		b'}'
+	))
+
+
+def bench(func, query, number):
+	return min(timeit.repeat(lambda: func(query), number=number, repeat=5)) / number
+
+
+def main(number=2000):
+	print(f'{"query":<14}{"render (us)":>14}{"compiled (us)":>16}{"speedup":>10}')
+	for name, query in queries.items():
+		rendered = bench(render_payload, query, number) * 1e6
+		compiled = bench(compiled_payload, query, number) * 1e6
+		print(f'{name:<14}{rendered:>14.2f}{compiled:>16.2f}{rendered / compiled:>9.1f}x')
+
+
+if __name__ == '__main__':
+	main()
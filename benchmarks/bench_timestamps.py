@@ -0,0 +1,59 @@
+from datetime import datetime
+import random
+import timeit
+
+from repltalk.timestamps import parse_timestamp
+
+# Compares datetime.strptime with parse_timestamp on the timestamps from a
+# feed page, run with: python -m benchmarks.bench_timestamps
+
+
+def feed_page_timestamps(posts=30, authors=12):
+	# Every post on a page has its own timestamp, but its author (and so
+	# their account creation timestamp) often shows up more than once
+	rng = random.Random(0)
+	timestamps = []
+	author_timestamps = [
+		f'20{rng.randint(16, 20)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}'
+		f'T{rng.randint(0, 23):02}:{rng.randint(0, 59):02}:{rng.randint(0, 59):02}'
+		f'.{rng.randint(0, 999):03}Z'
+		for _ in range(authors)
+	]
+	for i in range(posts):
+		timestamps.append(f'2020-08-27T12:{i % 60:02}:{rng.randint(0, 59):02}.{rng.randint(0, 999):03}Z')
+		timestamps.append(rng.choice(author_timestamps))
+	return timestamps
+
+
+def with_strptime(timestamps):
+	for timestamp in timestamps:
+		datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def with_parse_timestamp(timestamps):
+	for timestamp in timestamps:
+		parse_timestamp(timestamp)
+
+
+def with_parse_timestamp_cold(timestamps):
+	parse_timestamp.cache_clear()
+	with_parse_timestamp(timestamps)
+
+
+def main(number=500):
+	timestamps = feed_page_timestamps()
+	results = {
+		'strptime': with_strptime,
+		'parse_timestamp (cold)': with_parse_timestamp_cold,
+		'parse_timestamp (warm)': with_parse_timestamp,
+	}
+	baseline = None
+	print(f'parsing {len(timestamps)} timestamps from one feed page')
+	for name, func in results.items():
+		elapsed = min(timeit.repeat(lambda: func(timestamps), number=number, repeat=5)) / number
+		baseline = baseline or elapsed
+		print(f'{name:<24}{elapsed * 1e6:>9.1f} us{baseline / elapsed:>8.1f}x')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,243 @@
+import json
+import os
+import random
+
+# Responses shaped like the ones Repl Talk sends, for the fake server in
+# benchmarks.server to replay. Responses recorded from the real thing can
+# be used instead by putting them in a directory as <name>.json, with the
+# same names as the ones in responses().
+
+
+def timestamp(rng):
+	return (
+		f'20{rng.randint(16, 20)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}'
+		f'T{rng.randint(0, 23):02}:{rng.randint(0, 59):02}:{rng.randint(0, 59):02}'
+		f'.{rng.randint(0, 999):03}Z'
+	)
+
+
+def language(key):
+	return {
+		'id': key,
+		'displayName': key.title(),
+		'key': key,
+		'category': 'Practical',
+		'tagline': f'The {key} programming language',
+		'icon': f'https://replit.com/public/images/languages/{key}.svg',
+		'isNew': False
+	}
+
+
+def user(rng, user_id):
+	username = f'user{user_id}'
+	return {
+		'id': user_id,
+		'username': username,
+		'url': f'/@{username}',
+		'image': f'https://storage.googleapis.com/replit/images/{user_id}.png',
+		'karma': rng.randint(0, 5000),
+		'firstName': 'First',
+		'lastName': 'Last',
+		'fullName': 'First Last',
+		'displayName': username,
+		'isLoggedIn': False,
+		'bio': 'I like making things on Repl.it ' * rng.randint(0, 4),
+		'timeCreated': timestamp(rng),
+		'isHacker': rng.random() < 0.2,
+		'languages': [
+			language(key) for key in rng.sample(
+				['python3', 'nodejs', 'html', 'java', 'c', 'go', 'rust'], 3
+			)
+		],
+		'roles': [{
+			'id': 1, 'name': 'Content Creator', 'key': 'CONTENT_CREATOR',
+			'tagline': 'Makes content'
+		}] if rng.random() < 0.1 else []
+	}
+
+
+def board(slug):
+	return {
+		'id': len(slug),
+		'url': f'/talk/{slug}',
+		'slug': slug,
+		'cta': 'Create Post',
+		'titleCta': None,
+		'bodyCta': 'Write your post here',
+		'buttonCta': 'Post',
+		'description': f'The {slug} board',
+		'name': slug.title(),
+		'replRequired': slug == 'share',
+		'isLocked': False,
+		'isPrivate': False
+	}
+
+
+def comment(rng, comment_id, post_id, replies=0):
+	return {
+		'id': comment_id,
+		'body': 'This is a comment. ' * rng.randint(1, 20),
+		'voteCount': rng.randint(0, 20),
+		'timeCreated': timestamp(rng),
+		'timeUpdated': None,
+		'user': user(rng, rng.randint(1, 40)),
+		'url': f'/talk/share/post/{post_id}?commentId={comment_id}',
+		'post': {'id': post_id},
+		'parentComment': None,
+		'comments': [
+			comment(rng, comment_id * 100 + i, post_id) for i in range(replies)
+		],
+		'isAuthor': False,
+		'canEdit': False,
+		'canVote': True,
+		'canComment': True,
+		'hasVoted': False,
+		'canReport': True,
+		'hasReported': False,
+		'isAnswer': False,
+		'canSelectAsAnswer': False,
+		'canUnselectAsAnswer': False,
+		'preview': 'This is a comment.'
+	}
+
+
+def feed_comment(rng, comment_id):
+	# A comment in the feed of all comments, which comes with some of its post
+	post_id = rng.randint(1, 1000)
+	data = comment(rng, comment_id, post_id)
+	data['post'] = {
+		'id': post_id,
+		'url': f'/talk/share/post/{post_id}',
+		'title': f'Post {post_id}',
+		'user': user(rng, rng.randint(1, 40))
+	}
+	return data
+
+
+def connection(items, next_cursor=None):
+	return {
+		'pageInfo': {'hasNextPage': next_cursor is not None, 'nextCursor': next_cursor},
+		'items': items
+	}
+
+
+def post(rng, post_id, votes=10, comments=10):
+	repl_language = rng.choice(['python3', 'nodejs', 'html'])
+	return {
+		'id': post_id,
+		'title': f'Post number {post_id}',
+		'body': 'This is what the post says. ' * rng.randint(5, 60),
+		'showHosted': False,
+		'voteCount': rng.randint(0, 200),
+		'commentCount': comments,
+		'isPinned': False,
+		'isLocked': False,
+		'timeCreated': timestamp(rng),
+		'timeUpdated': timestamp(rng),
+		'url': f'/talk/share/post/{post_id}',
+		'user': user(rng, rng.randint(1, 40)),
+		'board': board(rng.choice(['share', 'ask', 'learn'])),
+		'repl': {
+			'id': f'{post_id:08x}-0000-0000-0000-000000000000',
+			'embedUrl': f'https://repl.it/@user/repl{post_id}?lite=true',
+			'hostedUrl': f'https://repl{post_id}.user.repl.co',
+			'title': f'repl{post_id}',
+			'lang': language(repl_language),
+			'language': repl_language,
+			'timeCreated': timestamp(rng)
+		} if rng.random() < 0.7 else None,
+		'comments': connection([
+			comment(rng, post_id * 1000 + i, post_id, replies=2) for i in range(comments)
+		], next_cursor='10' if comments else None),
+		'votes': connection([
+			{'id': post_id * 1000 + i, 'user': {'id': i}, 'post': {'id': post_id}}
+			for i in range(votes)
+		]),
+		'isAnnouncement': False,
+		'isAuthor': False,
+		'canEdit': False,
+		'canComment': True,
+		'canVote': True,
+		'canPin': False,
+		'canSetType': False,
+		'canChangeBoard': False,
+		'canLock': False,
+		'hasVoted': False,
+		'canReport': True,
+		'hasReported': False,
+		'isAnswered': False,
+		'isAnswerable': False,
+		'answeredBy': None,
+		'answer': None,
+		'preview': 'This is what the post says.'
+	}
+
+
+def report(rng, report_id):
+	data = {
+		'id': report_id,
+		'reason': 'spam',
+		'resolved': False,
+		'timeCreated': timestamp(rng),
+		'type': 'post',
+		'creator': user(rng, rng.randint(1, 40)),
+		'post': None,
+		'comment': None
+	}
+	if report_id % 3:
+		data['post'] = {
+			'url': f'/talk/share/post/{report_id}',
+			'body': 'Buy my things',
+			'id': report_id,
+			'user': user(rng, rng.randint(1, 40)),
+			'title': 'Spam'
+		}
+	else:
+		data['type'] = 'comment'
+		data['comment'] = {
+			'url': f'/talk/share/post/1?commentId={report_id}',
+			'body': 'Buy my things',
+			'post': {'id': 1},
+			'user': user(rng, rng.randint(1, 40)),
+			'id': report_id
+		}
+	return data
+
+
+def responses(seed=0):
+	# What the server replies with, by operation name. A post query that
+	# asks for its comments is under 'postComments', since 'comments' is the
+	# feed of comments from every post.
+	rng = random.Random(seed)
+	return {
+		'ReplPostsFeed': {'data': {'replPosts': connection(
+			[post(rng, 1000 + i, votes=10, comments=0) for i in range(30)],
+			next_cursor='30'
+		)}},
+		'post': {'data': {'post': post(rng, 1, votes=100, comments=10)}},
+		'postComments': {'data': {'post': {'comments': {
+			'pageInfo': {'nextCursor': '20'},
+			'items': [comment(rng, 5000 + i, 1, replies=3) for i in range(20)]
+		}}}},
+		'comments': {'data': {'comments': connection(
+			[feed_comment(rng, 9000 - i) for i in range(20)], next_cursor='20'
+		)}},
+		'userByUsername': {'data': {'user': user(rng, 1)}},
+		'leaderboard': {'data': {'leaderboard': connection(
+			[user(rng, 100 + i) for i in range(30)], next_cursor='30'
+		)}},
+		'boardReports': {'data': {'boardReports': [
+			report(rng, 1 + i) for i in range(30)
+		]}},
+	}
+
+
+def load(directory=None):
+	# The generated responses, with any recorded ones from directory instead
+	fixtures = responses()
+	if directory is not None:
+		for name in os.listdir(directory):
+			if name.endswith('.json'):
+				with open(os.path.join(directory, name)) as f:
+					fixtures[name[:-5]] = json.load(f)
+	return fixtures
@@ -0,0 +1,60 @@
+import json
+
+from aiohttp import web
+
+# A stand-in for Repl Talk's /graphql endpoint that replays fixture
+# responses, so the client can be measured without the network. The
+# responses are encoded once, so the server takes as little of the time
+# being measured as possible.
+
+
+class FakeServer():
+	__slots__ = ('responses', 'host', 'port', 'runner', 'requests')
+
+	def __init__(self, responses, host='127.0.0.1', port=0):
+		self.responses = {
+			name: json.dumps(response).encode() for name, response in responses.items()
+		}
+		self.host = host
+		self.port = port
+		self.runner = None
+		self.requests = 0
+
+	@property
+	def url(self):
+		return f'http://{self.host}:{self.port}'
+
+	async def handle_graphql(self, request):
+		self.requests += 1
+		body = await request.json()
+		name = body.get('operationName')
+		if name == 'post' and 'commentsOrder' in body.get('variables', {}):
+			name = 'postComments'
+		response = self.responses.get(name)
+		if response is None:
+			return web.json_response(
+				{'data': None, 'errors': [{'message': f'No fixture for {name}'}]}
+			)
+		return web.Response(body=response, content_type='application/json')
+
+	async def start(self):
+		app = web.Application()
+		app.router.add_post('/graphql', self.handle_graphql)
+		self.runner = web.AppRunner(app, access_log=None)
+		await self.runner.setup()
+		site = web.TCPSite(self.runner, self.host, self.port)
+		await site.start()
+		# With port 0, the OS picks a free one
+		self.port = site._server.sockets[0].getsockname()[1]
+		return self
+
+	async def close(self):
+		if self.runner is not None:
+			await self.runner.cleanup()
+			self.runner = None
+
+	async def __aenter__(self):
+		return await self.start()
+
+	async def __aexit__(self, exc_type, exc, tb):
+		await self.close()
@@ -1,6 +1,27 @@
 import aiohttp
-from datetime import datetime
-from repltalk.queries import Queries
+import asyncio
+from collections import deque
+import heapq
+import json
+import time
+from repltalk import graphql
+from repltalk.batching import Batcher
+from repltalk.cache import (
+	IdentityMap, ResponseCache, cached_slot, reset_cached_slots
+)
+from repltalk.export import (
+	Columns, comment_columns, post_column_fields, post_columns, read_columns
+)
+from repltalk.jsonlib import json_loads as default_json_loads
+from repltalk.metrics import Instrumentation, MetricsCollector
+from repltalk.pagination import (
+	PageReader, iter_items, stream_items, watch_items, weak_method
+)
+from repltalk.queries import Queries, post_field_names, post_queries
+from repltalk.ratelimit import RateLimiter, RetryPolicy
+from repltalk.scheduler import Scheduler
+from repltalk.streaming import ItemParser, ItemStream
+from repltalk.timestamps import parse_timestamp
 import warnings
 
 # Bots approved by the Repl.it Team (or me) that are allowed to log in
@@ -40,19 +61,23 @@ class InvalidLogin(ReplTalkException): pass
 class PostNotFound(ReplTalkException): pass
 
 
+# An AttributeError too, so that hasattr and getattr with a default still work
+class NotFetched(ReplTalkException, AttributeError): pass
+
+
 class Repl():
 	__slots__ = ('id', 'embed_url', 'url', 'title', 'language')
 
 	def __init__(
-		self, data
+		self, data, client=None
 	):
 		# Grab the attributes from the data object
 		self.id = data['id']
 		self.embed_url = data['embedUrl']
 		self.url = data['hostedUrl']
 		self.title = data['title']
-		self.language = Language(
-			data['lang']
+		self.language = get_language_object(
+			client, data['lang']
 		)
 
 	def __repr__(self):
@@ -76,8 +101,13 @@ class LazyPost():
 
 		self.url = data['url']
 		self.id = data['id']
-		self.content = data['body']
-		self.author = User(client, data['user'])
+		# Comments don't come with the body of their post
+		self.content = data.get('body')
+		# The user is None if their account was deleted
+		user = data['user']
+		if user is not None:
+			user = get_user_object(client, user)
+		self.author = user
 		self.title = data['title']
 	
 	async def delete(self):
@@ -92,6 +122,15 @@ class LazyPost():
 	async def get_full_post(self):
 		return await self.client.get_post(self.id)
 
+	def __repr__(self):
+		return repr(self.title)
+
+	def __eq__(self, post2):
+		return self.id == post2.id
+
+	def __hash__(self):
+		return hash(self.id)
+
 
 # A LazyComment contains limited information about the comment,
 # so it doesn't include things like replies
@@ -101,7 +140,7 @@ class LazyComment():
 		self.url = data['url']
 		self.id = data['id']
 		self.content = data['body']
-		self.author = User(client, data['user'])
+		self.author = get_user_object(client, data['user'])
 		
 	async def delete(self):
 		client = self.client
@@ -129,7 +168,7 @@ class Report:
 		self.reason = data['reason']
 		self.resolved = data['resolved']
 		self.timestamp = data['timeCreated']  # Should this be parsed? if so, fix test_report_get_attached test
-		self.creator = User(client, data['creator'])
+		self.creator = get_user_object(client, data['creator'])
 		self.client = client
 		self.deleted = False
 		# There are two types of reports, post reports and comment reports.
@@ -168,7 +207,7 @@ class LazyReport:
 		self.client = client
 		self.id = data['id']
 		self.reason = data['reason']
-		self.creator = User(client, data['creator'])
+		self.creator = get_user_object(client, data['creator'])
 		self.deleted = True
 
 	def __str__(self):
@@ -222,11 +261,13 @@ class ReportList():
 
 class AsyncPostList():
 	__slots__ = (
-		'i', 'client', 'sort', 'search', 'after', 'limit', 'posts_queue', 'board'
+		'i', 'client', 'sort', 'search', 'after', 'limit', 'posts_queue', 'board',
+		'reader', 'fields', 'stream', 'streamed', 'items', '__weakref__'
 	)
 
 	def __init__(
-		self, client, board, limit=32, sort='new', search='', after=None
+		self, client, board, limit=32, sort='new', search='', after=None,
+		prefetch=0, fields=None, stream=False
 	):
 		self.i = 0
 		self.client = client
@@ -234,33 +275,175 @@ class AsyncPostList():
 		self.sort = sort
 		self.search = search
 		self.after = after
+		self.fields = fields
+		# With stream, every post is made as soon as it arrives instead of
+		# once its whole page has
+		self.stream = stream
+		self.streamed = None
+		self.items = None
 
 		self.limit = limit
-		self.posts_queue = []
+		self.posts_queue = deque()
 
 		self.board = board
+		# With prefetch, the next pages are requested in the background
+		# while the current one is being iterated over
+		self.reader = PageReader(
+			weak_method(self._fetch_page), after=after, prefetch=prefetch,
+			max_items=limit
+		)
+
+	async def _fetch_page(self, after):
+		new_posts = await self.board._get_posts(
+			sort=self.sort,
+			search=self.search,
+			after=after,
+			fields=self.fields
+		)
+		return new_posts['items'], new_posts['pageInfo']['nextCursor']
+
+	def _open_stream(self, after):
+		self.after = after
+		self.streamed = self.board._stream_posts(
+			sort=self.sort,
+			search=self.search,
+			after=after,
+			fields=self.fields
+		)
+		return self.streamed
 
 	def __aiter__(self):
 		return self
 
 	async def __anext__(self):
 		if self.i >= self.limit:
+			self.close()
 			raise StopAsyncIteration
+		if self.stream:
+			if self.items is None:
+				self.items = stream_items(self._open_stream, self.limit, self.after)
+			try:
+				current_post_raw = await self.items.__anext__()
+			except StopAsyncIteration:
+				self.close()
+				raise
+			self.i += 1
+			return get_post_object(self.client, current_post_raw)
 		if len(self.posts_queue) == 0:
-			new_posts = await self.board._get_posts(
-				sort=self.sort,
-				search=self.search,
-				after=self.after
-			)
-			self.posts_queue.extend(new_posts['items'])
-			self.after = new_posts['pageInfo']['nextCursor']
-		current_post_raw = self.posts_queue.pop(0)
+			new_posts = await self.reader.next_page()
+			self.after = self.reader.after
+			if not new_posts:
+				self.close()
+				raise StopAsyncIteration
+			self.posts_queue.extend(new_posts)
+		current_post_raw = self.posts_queue.popleft()
 		current_post = get_post_object(self.client, current_post_raw)
 
 		self.i += 1
 
 		return current_post
 
+	async def _streamed_pages(self):
+		# Whole pages, each read from its own stream. If a page has already
+		# partly been gone through, the rest of it comes first.
+		after = self.after
+		if self.items is not None:
+			stream = self.streamed
+			page = [post async for post in stream]
+			await self.items.aclose()
+			self.items = None
+			if stream.rest is None:
+				# It was closed
+				return
+			after = self.after = stream.page['pageInfo']['nextCursor']
+			page = page[:self.limit - self.i]
+			self.i += len(page)
+			if page:
+				yield page
+			if after is None:
+				return
+		while self.i < self.limit:
+			stream = self._open_stream(after)
+			page = [post async for post in stream]
+			after = self.after = stream.page['pageInfo']['nextCursor']
+			if not page:
+				break
+			page = page[:self.limit - self.i]
+			self.i += len(page)
+			yield page
+			if after is None:
+				break
+
+	async def _raw_pages(self):
+		# The rest of the posts as they came in the response, a page at a time
+		if self.stream:
+			async for page in self._streamed_pages():
+				yield page
+			return
+		if self.posts_queue:
+			page = list(self.posts_queue)[:self.limit - self.i]
+			self.posts_queue.clear()
+			self.i += len(page)
+			yield page
+		while self.i < self.limit:
+			page = await self.reader.next_page()
+			self.after = self.reader.after
+			if not page:
+				break
+			page = page[:self.limit - self.i]
+			self.i += len(page)
+			yield page
+
+	async def pages(self):
+		# Yields a list of posts for every page, instead of one post at a time
+		try:
+			async for page in self._raw_pages():
+				yield [get_post_object(self.client, post) for post in page]
+		finally:
+			self.close()
+
+	async def to_columns(self):
+		# Reads the rest of the posts into Columns without making any Posts. If
+		# the fields weren't chosen, only the ones in the columns are asked for.
+		if (
+			self.fields is None and self.i == 0 and self.items is None
+			and self.reader.task is None and self.reader.fetched == 0
+		):
+			self.fields = post_column_fields
+		columns = Columns(post_columns)
+		try:
+			async for page in self._raw_pages():
+				columns.extend(page)
+		finally:
+			self.close()
+		return columns
+
+	async def to_arrays(self):
+		# Like to_columns, but as NumPy arrays
+		return (await self.to_columns()).to_numpy()
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		self.close()
+
+	def close(self):
+		# Stops fetching pages in the background
+		self.reader.close()
+		if self.streamed is not None:
+			self.streamed.close()
+
+	async def aclose(self):
+		self.close()
+
+	def __del__(self):
+		try:
+			self.reader.close()
+		except (AttributeError, RuntimeError):
+			# The event loop might already be closed
+			pass
+
 	def __await__(self):
 		post_list = PostList(
 			client=self.client,
@@ -273,6 +456,235 @@ class AsyncPostList():
 		return post_list.next().__await__()
 
 
+class MergedPostList():
+	# The posts of several AsyncPostLists, merged by time or votes without
+	# duplicates. Every list only has its next post read when it's needed.
+	__slots__ = ('post_lists', 'key', 'limit', 'heap', 'seen', 'started')
+
+	def __init__(self, post_lists, sort, limit):
+		self.post_lists = post_lists
+		if sort == 'new':
+			self.key = lambda post: -post.timestamp.timestamp()
+		else:
+			self.key = lambda post: -post.votes
+		self.limit = limit
+		self.heap = []
+		self.seen = set()
+		self.started = False
+
+	async def _next_post(self, i):
+		try:
+			post = await self.post_lists[i].__anext__()
+		except StopAsyncIteration:
+			return
+		heapq.heappush(self.heap, (self.key(post), i, post))
+
+	def __aiter__(self):
+		return self
+
+	async def __anext__(self):
+		if not self.started:
+			self.started = True
+			await asyncio.gather(
+				*(self._next_post(i) for i in range(len(self.post_lists)))
+			)
+		while self.heap and len(self.seen) < self.limit:
+			_, i, post = heapq.heappop(self.heap)
+			await self._next_post(i)
+			if post.id in self.seen:
+				continue
+			self.seen.add(post.id)
+			return post
+		self.close()
+		raise StopAsyncIteration
+
+	async def to_columns(self):
+		# Reads the rest of the posts into Columns
+		columns = Columns(post_columns)
+		try:
+			async for post in self:
+				columns.extend((post.data,))
+		finally:
+			self.close()
+		return columns
+
+	async def to_arrays(self):
+		# Like to_columns, but as NumPy arrays
+		return (await self.to_columns()).to_numpy()
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		self.close()
+
+	def close(self):
+		for post_list in self.post_lists:
+			post_list.close()
+
+	async def aclose(self):
+		self.close()
+
+
+class AsyncCommentList():
+	# The comments from all of Repl Talk. Every page is turned into Comments
+	# all at once, and after is where to carry on from later.
+	__slots__ = (
+		'i', 'client', 'order', 'limit', 'comments_queue', 'reader', 'cursors',
+		'page_after', 'next_after', 'page_length', 'offset', '__weakref__'
+	)
+
+	def __init__(self, client, order='new', limit=None, after=None, prefetch=0):
+		self.i = 0
+		self.client = client
+		self.order = order
+		self.limit = limit
+		self.comments_queue = deque()
+		# after is either a cursor, or a cursor and how many comments of that
+		# page were already gone through
+		offset = 0
+		if isinstance(after, (list, tuple)):
+			after, offset = after
+		# The cursor that every fetched page was requested with and the one
+		# after it, oldest first
+		self.cursors = deque()
+		# Where the page that's being gone through is, and how much of it has
+		# been gone through
+		self.page_after = after
+		self.next_after = None
+		self.page_length = None
+		self.offset = offset
+		self.reader = PageReader(
+			weak_method(self._fetch_page), after=after, prefetch=prefetch,
+			max_items=None if limit is None else limit + offset
+		)
+
+	@property
+	def after(self):
+		# Can be given to get_all_comments to carry on from the next comment
+		# that hasn't been gone through, even if it's in the middle of a page
+		if self.offset == 0:
+			return self.page_after
+		if self.offset >= self.page_length and self.next_after is not None:
+			return self.next_after
+		return [self.page_after, self.offset]
+
+	async def _fetch_page(self, after):
+		comments = await self.client._get_all_comments(order=self.order, after=after)
+		next_after = comments['pageInfo']['nextCursor']
+		self.cursors.append((after, next_after))
+		return comments['items'], next_after
+
+	async def _next_raw_page(self):
+		# The comments in the next page that haven't been gone through yet
+		if self.page_length is not None and self.offset >= self.page_length:
+			if self.next_after is None:
+				return []
+			self.page_after, self.offset = self.next_after, 0
+		page = await self.reader.next_page()
+		if not page:
+			return []
+		self.page_after, self.next_after = self.cursors.popleft()
+		self.page_length = len(page)
+		page = page[self.offset:]
+		if self.limit is not None:
+			page = page[:self.limit - self.i]
+		return page
+
+	async def _next_page(self):
+		client = self.client
+		return [
+			get_comment_object(client, c, LazyPost(client, c['post']))
+			for c in await self._next_raw_page()
+		]
+
+	def _used(self, count):
+		self.i += count
+		self.offset += count
+
+	def __aiter__(self):
+		return self
+
+	async def __anext__(self):
+		if self.limit is not None and self.i >= self.limit:
+			self.close()
+			raise StopAsyncIteration
+		if not self.comments_queue:
+			self.comments_queue.extend(await self._next_page())
+			if not self.comments_queue:
+				self.close()
+				raise StopAsyncIteration
+		self._used(1)
+		return self.comments_queue.popleft()
+
+	async def to_columns(self):
+		# Reads the rest of the comments into Columns without making any
+		# Comments
+		columns = Columns(comment_columns)
+		try:
+			if self.comments_queue:
+				columns.extend([comment.data for comment in self.comments_queue])
+				self._used(len(self.comments_queue))
+				self.comments_queue.clear()
+			while self.limit is None or self.i < self.limit:
+				page = await self._next_raw_page()
+				if not page:
+					break
+				self._used(len(page))
+				columns.extend(page)
+		finally:
+			self.close()
+		return columns
+
+	async def to_arrays(self):
+		# Like to_columns, but as NumPy arrays
+		return (await self.to_columns()).to_numpy()
+
+	async def pages(self):
+		# Yields a list of comments for every page
+		try:
+			if self.comments_queue:
+				page = list(self.comments_queue)
+				self.comments_queue.clear()
+				self._used(len(page))
+				yield page
+			while self.limit is None or self.i < self.limit:
+				page = await self._next_page()
+				if not page:
+					break
+				self._used(len(page))
+				yield page
+		finally:
+			self.close()
+
+	async def _first_page(self):
+		page = await self._next_page()
+		self._used(len(page))
+		return page
+
+	def __await__(self):
+		# Doing await get_all_comments() gets just the first page
+		return self._first_page().__await__()
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		self.close()
+
+	def close(self):
+		self.reader.close()
+
+	async def aclose(self):
+		self.close()
+
+	def __del__(self):
+		try:
+			self.reader.close()
+		except (AttributeError, RuntimeError):
+			pass
+
+
 class PostList(list):
 	__slots__ = ('posts', 'after', 'board', 'sort', 'search', 'i', 'client')
 
@@ -373,21 +785,22 @@ class CommentList(list):
 
 class Comment():
 	__slots__ = (
-		'client', 'id', 'content', 'timestamp', 'can_edit', 'can_comment',
+		'client', 'id', 'content', '_timestamp', 'can_edit', 'can_comment',
 		'can_report', 'has_reported', 'path', 'url', 'votes', 'can_vote',
-		'has_voted', 'author', 'post', 'replies', 'parent'
+		'has_voted', '_author', 'post', '_replies', 'parent', 'data'
 	)
 
+	# The timestamp, author and replies are only made when they're used
+
 	def __init__(
 		self, client, data, post, parent=None
 	):
 		self.client = client
+		self.data = data
 		self.id = data['id']
 		self.content = data.get('body')
 		if self.content is None:
 			return
-		timestamp = data['timeCreated']
-		self.timestamp = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%fZ')
 		self.can_edit = data['canEdit']
 		self.can_comment = data['canComment']
 		self.can_report = data['canReport']
@@ -398,27 +811,32 @@ class Comment():
 		self.can_vote = data['canVote']
 		self.has_voted = data['hasVoted']
 		self.parent = parent
-		user = data['user']
+		self.post = post  # Should already be a post object
 
+	@cached_slot
+	def timestamp(self):
+		return parse_timestamp(self.data['timeCreated'])
+
+	@cached_slot
+	def author(self):
+		user = self.data['user']
 		if user is not None:
-			user = User(
-				client,
-				user=user
-			)
-		self.author = user
-		self.post = post  # Should already be a post object
+			user = get_user_object(self.client, user)
+		return user
 
-		raw_replies = data.get('comments', [])
+	@cached_slot
+	def replies(self):
+		raw_replies = self.data.get('comments', [])
 		replies = []
 
 		for inner_reply in raw_replies:
-			replies.append(Comment(
+			replies.append(get_comment_object(
 				self.client,
-				data=inner_reply,
-				post=self.post,
+				inner_reply,
+				self.post,
 				parent=self
 			))
-		self.replies = replies
+		return replies
 
 	def __repr__(self):
 		if len(self.content) > 100:
@@ -443,10 +861,10 @@ class Comment():
 			}
 		)
 		c = c['comment']
-		return Comment(
+		return get_comment_object(
 			self.client,
-			data=c,
-			post=self.post,
+			c,
+			self.post,
 			parent=self
 		)
 
@@ -482,15 +900,28 @@ class Board():
 	def __init__(self, client):
 		self.client = client
 
-	async def _get_posts(self, sort, search, after):
+	async def _get_posts(self, sort, search, after, fields=None):
 		return await self.client._posts_in_board(
 			board_slugs=[self.name],
 			order=sort,
 			search_query=search,
-			after=after
+			after=after,
+			fields=fields
 		)
 
-	def get_posts(self, sort='top', search='', limit=32, after=None):
+	def _stream_posts(self, sort, search, after, fields=None):
+		return self.client._stream_posts_in_board(
+			board_slugs=[self.name],
+			order=sort,
+			search_query=search,
+			after=after,
+			fields=fields
+		)
+
+	def get_posts(
+		self, sort='top', search='', limit=32, after=None, prefetch=0, fields=None,
+		stream=False
+	):
 		if sort == 'top':
 			sort = 'votes'
 		return AsyncPostList(
@@ -499,7 +930,10 @@ class Board():
 			sort=sort,
 			search=search,
 			after=after,
-			board=self
+			board=self,
+			prefetch=prefetch,
+			fields=fields,
+			stream=stream
 		)
 
 	async def create_post(  # TODO
@@ -514,6 +948,36 @@ class Board():
 		return hash((self.name,))
 
 
+class MultiBoard(Board):  # several boards at once, in one feed
+	__slots__ = ('slugs',)
+
+	def __init__(self, client, slugs):
+		self.client = client
+		self.slugs = list(slugs)
+		self.name = ', '.join(self.slugs)
+
+	async def _get_posts(self, sort, search, after, fields=None):
+		return await self.client._posts_in_board(
+			board_slugs=self.slugs,
+			order=sort,
+			search_query=search,
+			after=after,
+			fields=fields
+		)
+
+	def _stream_posts(self, sort, search, after, fields=None):
+		return self.client._stream_posts_in_board(
+			board_slugs=self.slugs,
+			order=sort,
+			search_query=search,
+			after=after,
+			fields=fields
+		)
+
+	def __hash__(self):
+		return hash(tuple(self.slugs))
+
+
 class RichBoard(Board):  # a board with more stuff than usual
 	__slots__ = (
 		'client', 'id', 'url', 'name', 'slug', 'title_cta', 'body_cta',
@@ -554,12 +1018,13 @@ class RichBoard(Board):  # a board with more stuff than usual
 class Language():
 	__slots__ = (
 		'id', 'display_name', 'key', 'category', 'is_new', 'icon', 'icon_path',
-		'tagline'
+		'tagline', 'data'
 	)
 
 	def __init__(
 		self, data
 	):
+		self.data = data
 		self.id = data['id']
 		self.display_name = data['displayName']
 		self.key = data['key']  # identical to id???
@@ -595,75 +1060,196 @@ class Language():
 		))
 
 
+def get_entity(client, cls, data, *args):
+	# Goes through the client's identity map if it has one, so there's only
+	# ever one object for each id
+	if client is None:
+		return cls(*args)
+	instrumentation = client.instrumentation
+	if instrumentation is not None:
+		start = time.perf_counter()
+	identity_map = client.identity_map
+	if identity_map is None:
+		entity = cls(*args)
+	else:
+		entity = identity_map.get(cls, data, args)
+	if instrumentation is not None:
+		instrumentation.phase(cls.__name__, 'construct', time.perf_counter() - start)
+	return entity
+
+
 def get_post_object(client, post):
-	return Post(
-		client, data=post
-	)
+	return get_entity(client, Post, post, client, post)
+
+
+def get_user_object(client, user):
+	return get_entity(client, User, user, client, user)
+
+
+def get_board_object(client, board):
+	return get_entity(client, RichBoard, board, client, board)
+
+
+def get_language_object(client, language):
+	return get_entity(client, Language, language, language)
+
+
+def get_comment_object(client, comment, post, parent=None):
+	return get_entity(client, Comment, comment, client, comment, post, parent)
+
+
+# The field that each attribute of a Post comes from
+post_fields = {
+	'title': 'title',
+	'content': 'body',
+	'is_announcement': 'isAnnouncement',
+	'path': 'url',
+	'url': 'url',
+	'board': 'board',
+	'timestamp': 'timeCreated',
+	'can_edit': 'canEdit',
+	'can_comment': 'canComment',
+	'can_pin': 'canPin',
+	'can_set_type': 'canSetType',
+	'can_report': 'canReport',
+	'has_reported': 'hasReported',
+	'is_locked': 'isLocked',
+	'show_hosted': 'showHosted',
+	'votes': 'voteCount',
+	'vote_list': 'votes',
+	'can_vote': 'canVote',
+	'has_voted': 'hasVoted',
+	'author': 'user',
+	'repl': 'repl',
+	'language': 'repl',
+	'answered': 'isAnswered',
+	'can_answer': 'isAnswerable',
+	'pinned': 'isPinned',
+	'comment_count': 'commentCount',
+}
 
 
 class Post():
 	__slots__ = (
 		'client', 'id', 'title', 'content', 'is_announcement', 'path', 'url',
-		'board', 'timestamp', 'can_edit', 'can_comment', 'can_pin', 'can_set_type',
+		'_board', '_timestamp', 'can_edit', 'can_comment', 'can_pin', 'can_set_type',
 		'can_report', 'has_reported', 'is_locked', 'show_hosted', 'votes',
-		'can_vote', 'has_voted', 'author', 'repl', 'answered', 'can_answer',
-		'pinned', 'comment_count', 'language', 'vote_list', 'data'
+		'can_vote', 'has_voted', '_author', '_repl', 'answered', 'can_answer',
+		'pinned', 'comment_count', '_language', 'vote_list', 'data'
 	)
 
+	# The board, timestamp, author and repl are only made when they're used
+
 	def __init__(
 		self, client, data
 	):
 		self.client = client
+		self.id = data['id']
+		try:
+			self.title = data['title']
+			self.content = data['body']
+			self.is_announcement = data['isAnnouncement']
+			self.path = data['url']
+			self.url = base_url + data['url']
+			self.can_edit = data['canEdit']
+			self.can_comment = data['canComment']
+			self.can_pin = data['canPin']
+			self.can_set_type = data['canSetType']
+			self.can_report = data['canReport']
+			self.has_reported = data['hasReported']
+			self.is_locked = data['isLocked']
+			self.show_hosted = data['showHosted']
+			self.votes = data['voteCount']
+			self.vote_list = data['votes']['items']
+
+			self.can_vote = data['canVote']
+			self.has_voted = data['hasVoted']
+
+			self.answered = data['isAnswered']
+			self.can_answer = data['isAnswerable']
+			self.pinned = data['isPinned']
+			self.comment_count = data['commentCount']
+		except KeyError:
+			# Only some of the fields were fetched
+			self.set_partial(data)
+			return
 		self.data = data
 
-		self.id = data['id']
-		self.title = data['title']
-		self.content = data['body']
-		self.is_announcement = data['isAnnouncement']
-		self.path = data['url']
-		self.url = base_url + data['url']
-		board = RichBoard(
-			client=client,
-			data=data['board']
+	def set_partial(self, data):
+		# Sets the attributes that were fetched, and the rest raise NotFetched
+		# when they're used. Anything that was already fetched before is kept.
+		try:
+			old_data = self.data
+		except AttributeError:
+			old_data = None
+		if old_data is not None:
+			data = {**old_data, **data}
+		self.data = data
+		for attribute, field in post_fields.items():
+			if field in data and not isinstance(getattr(Post, attribute), cached_slot):
+				setattr(self, attribute, data[field])
+		if 'url' in data:
+			self.url = base_url + data['url']
+		if 'votes' in data:
+			self.vote_list = data['votes']['items']
+
+	def __getattr__(self, name):
+		# Only used when an attribute isn't set, because it wasn't fetched
+		field = post_fields.get(name)
+		if field is None:
+			raise AttributeError(f"'Post' object has no attribute '{name}'")
+		raise self.not_fetched(field)
+
+	def get_field(self, field):
+		try:
+			return self.data[field]
+		except KeyError:
+			raise self.not_fetched(field) from None
+
+	def not_fetched(self, field):
+		return NotFetched(
+			f'The {field} field of post {self.id} wasn\'t fetched, '
+			'use await post.load() to get all of it'
 		)
-		self.board = board
-		timestamp = data['timeCreated']
-		self.timestamp = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%fZ')
-		self.can_edit = data['canEdit']
-		self.can_comment = data['canComment']
-		self.can_pin = data['canPin']
-		self.can_set_type = data['canSetType']
-		self.can_report = data['canReport']
-		self.has_reported = data['hasReported']
-		self.is_locked = data['isLocked']
-		self.show_hosted = data['showHosted']
-		self.votes = data['voteCount']
-		self.vote_list = data['votes']['items']
 
-		self.can_vote = data['canVote']
-		self.has_voted = data['hasVoted']
+	@cached_slot
+	def board(self):
+		return get_board_object(self.client, self.get_field('board'))
 
-		user = data['user']
+	@cached_slot
+	def timestamp(self):
+		return parse_timestamp(self.get_field('timeCreated'))
+
+	@cached_slot
+	def author(self):
+		user = self.get_field('user')
 		if user is not None:
-			user = User(
-				client,
-				user=user
-			)
-		self.author = user
+			user = get_user_object(self.client, user)
+		return user
 
-		repl = data['repl']
+	@cached_slot
+	def repl(self):
+		repl = self.get_field('repl')
 		if repl is None:
-			self.repl = None
-			self.language = None
-		else:
-			self.repl = Repl(repl)
-			self.language = self.repl.language
-		self.answered = data['isAnswered']
-		self.can_answer = data['isAnswerable']
-		self.pinned = data['isPinned']
-		self.comment_count = data['commentCount']
+			return None
+		return Repl(repl, self.client)
+
+	@cached_slot
+	def language(self):
+		if self.repl is None:
+			return None
+		return self.repl.language
+
+	async def load(self):
+		# Gets all of the fields, for posts that were fetched with only some
+		data = await self.client._get_post(self.id)
+		self.__init__(self.client, data)
+		reset_cached_slots(self)
+		return self
 
 	def __repr__(self):
+		if 'title' not in self.data:
+			return f'<Post {self.id}>'
 		return f'<{self.title}>'
 
 	def __eq__(self, post2):
@@ -701,13 +1287,61 @@ class Post():
 		)
 		comments = []
 		for c in _comments['comments']['items']:
-			comments.append(Comment(
+			comments.append(get_comment_object(
 				self.client,
-				data=c,
-				post=self
+				c,
+				self
 			))
 		return comments
 
+	async def iter_comments(self, order='new', concurrency=4):
+		# Goes through every page of comments, yielding them as they arrive.
+		# The next page and any replies that only came as ids are fetched at
+		# the same time, with at most concurrency requests at once.
+		client = self.client
+		semaphore = asyncio.Semaphore(concurrency)
+
+		async def limited(coroutine):
+			async with semaphore:
+				return await coroutine
+
+		async def fetch_page(after):
+			comments = (await limited(
+				client._get_comments(self.id, order, after)
+			))['comments']
+			return comments['items'], comments['pageInfo']['nextCursor']
+
+		async def complete(comment):
+			replies = comment.replies
+			missing = [i for i, reply in enumerate(replies) if reply.content is None]
+			fetched = await asyncio.gather(*(
+				limited(client._get_comment(replies[i].id)) for i in missing
+			))
+			for i, data in zip(missing, fetched):
+				if data is not None:
+					replies[i] = get_comment_object(client, data, self, parent=comment)
+			await asyncio.gather(*(
+				complete(reply) for reply in replies if reply.content is not None
+			))
+
+		reader = PageReader(fetch_page, prefetch=1)
+		try:
+			while True:
+				page = await reader.next_page()
+				if not page:
+					break
+				comments = [get_comment_object(client, c, self) for c in page]
+				tasks = [asyncio.ensure_future(complete(c)) for c in comments]
+				try:
+					for comment, task in zip(comments, tasks):
+						await task
+						yield comment
+				finally:
+					for task in tasks:
+						task.cancel()
+		finally:
+			reader.close()
+
 	async def post_comment(self, content):
 		c = await self.client.perform_graphql(
 			'createComment',
@@ -718,17 +1352,17 @@ class Post():
 			}
 		)
 		c = c['comment']
-		return Comment(
-			client=self.client,
-			data=c,
-			post=self,
+		return get_comment_object(
+			self.client,
+			c,
+			self
 		)
 
 	def __hash__(self):
 		return hash((
 			self.id,
-			self.title,
-			self.content
+			self.data.get('title'),
+			self.data.get('body')
 		))
 
 
@@ -736,9 +1370,11 @@ class User():
 	__slots__ = (
 		'client', 'data', 'id', 'name', 'avatar', 'url', 'cycles', 'roles',
 		'full_name', 'first_name', 'last_name', 'is_logged_in',
-		'bio', 'is_hacker', 'languages', 'timestamp', 'data'
+		'bio', 'is_hacker', '_languages', '_timestamp'
 	)
 
+	# The timestamp and languages are only made when they're used
+
 	def __init__(
 		self, client, user
 	):
@@ -757,15 +1393,20 @@ class User():
 		self.first_name = user['firstName']
 		self.last_name = user['lastName']
 
-		time_created = user['timeCreated']
-		self.timestamp = datetime.strptime(time_created, '%Y-%m-%dT%H:%M:%S.%fZ')
-
 		self.is_logged_in = user['isLoggedIn']
 		self.bio = user['bio']
+
+	@cached_slot
+	def timestamp(self):
+		return parse_timestamp(self.data['timeCreated'])
+
+	@cached_slot
+	def languages(self):
 		# Convert all of the user's frequently used
 		# languages into Language objects
-		self.languages = [
-			Language(language) for language in user['languages']
+		return [
+			get_language_object(self.client, language)
+			for language in self.data['languages']
 		]
 
 	async def get_comments(self, limit=30, order='new'):
@@ -778,10 +1419,10 @@ class User():
 		comments = []
 		for c in _comments['comments']['items']:
 
-			comments.append(Comment(
+			comments.append(get_comment_object(
 				client,
-				data=c,
-				post=c['post']['id']
+				c,
+				c['post']['id']
 			))
 
 		return comments
@@ -797,9 +1438,9 @@ class User():
 		posts = []
 		for p in _posts['posts']['items']:
 
-			posts.append(Post(
+			posts.append(get_post_object(
 				client,
-				data=p
+				p
 			))
 
 		return posts
@@ -821,8 +1462,72 @@ class User():
 
 		repl_list_raw = public_repls_data['items']
 
-		repl_list = [Repl(r) for r in repl_list_raw]
+		repl_list = [Repl(r, self.client) for r in repl_list_raw]
 		return repl_list
+
+	# These go through everything page by page, page_size items at a time,
+	# instead of asking for all of it in one giant request
+
+	async def iter_comments(
+		self, order='new', page_size=30, limit=None, after=None, prefetch=0
+	):
+		client = self.client
+
+		async def fetch(after):
+			comments = (await client._get_user_comments(
+				self.id, page_size, order, after
+			))['comments']
+			return comments['items'], comments['pageInfo']['nextCursor']
+
+		async for c in iter_items(fetch, limit, after, prefetch):
+			yield get_comment_object(client, c, c['post']['id'])
+
+	async def iter_posts(
+		self, order='new', page_size=30, limit=None, after=None, prefetch=0,
+		stream=False
+	):
+		client = self.client
+
+		if stream:
+			# Every post is given as soon as it arrives instead of once its
+			# whole page has
+			def open_stream(after):
+				return client.stream_graphql(
+					'user',
+					Queries.get_user_posts,
+					('data', 'user', 'posts', 'items'),
+					user_id=self.id,
+					count=page_size,
+					order=order,
+					after=after
+				)
+
+			async for p in stream_items(open_stream, limit, after):
+				yield get_post_object(client, p)
+			return
+
+		async def fetch(after):
+			posts = (await client._get_user_posts(
+				self.id, page_size, order, after
+			))['posts']
+			return posts['items'], posts['pageInfo']['nextCursor']
+
+		async for p in iter_items(fetch, limit, after, prefetch):
+			yield get_post_object(client, p)
+
+	async def iter_repls(
+		self, page_size=30, limit=None, pinned_first=False, after=None, prefetch=0
+	):
+		client = self.client
+
+		async def fetch(after):
+			repls = (await client._get_user_repls(
+				self, page_size, pinned_first, None, after, None
+			))['publicRepls']
+			return repls['items'], repls['pageInfo']['nextCursor']
+
+		async for r in iter_items(fetch, limit, after, prefetch):
+			yield Repl(r, client)
 	
 	async def ban(self, reason):
 		client = self.client
@@ -891,10 +1596,7 @@ class Leaderboards():
 		if ended:
 			raise StopAsyncIteration
 		user = self.raw_users[len(self.users)]
-		user = User(
-			self,
-			user=user
-		)
+		user = get_user_object(self.client, user)
 
 		self.users.append(user)
 		return user
@@ -909,48 +1611,165 @@ class Leaderboards():
 
 
 class Client():
-	__slots__ = ('default_ref', 'default_requested_with', 'sid', 'boards')
+	__slots__ = (
+		'default_ref', 'default_requested_with', 'sid', 'boards', 'session',
+		'session_loop',
+		'connection_limit', 'connection_limit_per_host', 'keepalive_timeout',
+		'dns_cache_ttl', 'batcher', 'identity_map', 'response_cache',
+		'rate_limiter', 'retry_policy', 'scheduler', 'instrumentation',
+		'json_loads'
+	)
 
-	def __init__(self):
+	def __init__(
+		self,
+		connection_limit=100,
+		connection_limit_per_host=0,
+		keepalive_timeout=30,
+		dns_cache_ttl=300,
+		batch_size=25,
+		identity_map=None,
+		response_cache=None,
+		rate_limiter=None,
+		retry_policy=None,
+		max_queries=8,
+		max_mutations=4,
+		instrumentation=None,
+		json_loads=None
+	):
 		self.default_ref = base_url + '/@mat1/repl-talk-api'
 		self.default_requested_with = 'ReplTalk'
 		self.sid = None
 		self.boards = self._boards(self)
 
+		# The session is created lazily since aiohttp wants it to be made
+		# inside of a running event loop
+		self.session = None
+		self.session_loop = None
+		self.connection_limit = connection_limit
+		self.connection_limit_per_host = connection_limit_per_host
+		self.keepalive_timeout = keepalive_timeout
+		self.dns_cache_ttl = dns_cache_ttl
+
+		self.batcher = Batcher(self, max_size=batch_size, error=GraphqlError)
+		# An optional IdentityMap, which makes objects for the same
+		# thing be shared instead of getting made again every time
+		self.identity_map = identity_map
+		# An optional ResponseCache for the responses of read only queries
+		self.response_cache = response_cache
+		# An optional RateLimiter, and how failed requests get retried
+		self.rate_limiter = rate_limiter
+		self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+		# Queries and mutations have separate limits on how many can be
+		# running at the same time
+		self.scheduler = Scheduler(queries=max_queries, mutations=max_mutations)
+		# Optionally gets told how long every part of each request takes,
+		# like a MetricsCollector
+		self.instrumentation = instrumentation
+		# What decodes the responses, orjson or ujson if one's installed
+		self.json_loads = json_loads if json_loads is not None else default_json_loads
+
+	async def __aenter__(self):
+		self._get_session()
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		await self.close()
+
+	def _get_session(self):
+		# A session can only be used from the loop it was made in, so a new
+		# one is made if the client is used from another loop (like a second
+		# asyncio.run). The old one can't be closed from here, since its
+		# loop isn't running.
+		loop = asyncio.get_running_loop()
+		if (
+			self.session is None or self.session.closed
+			or self.session_loop is not loop
+		):
+			self.session_loop = loop
+			connector = aiohttp.TCPConnector(
+				limit=self.connection_limit,
+				limit_per_host=self.connection_limit_per_host,
+				keepalive_timeout=self.keepalive_timeout,
+				use_dns_cache=True,
+				ttl_dns_cache=self.dns_cache_ttl
+			)
+			self.session = aiohttp.ClientSession(connector=connector)
+		return self.session
+
+	async def close(self):
+		if self.session is not None:
+			await self.session.close()
+			self.session = None
+
+	def batch(self):
+		# Inside of this, requests that can be batched and are made at the
+		# same time get merged into one query
+		return self.batcher
+
+	async def perform_batchable(
+		self, batch_field, operation_name, query, **variables
+	):
+		if self.batcher.active:
+			return await self.batcher.load(batch_field, variables)
+		return await self.perform_graphql(operation_name, query, **variables)
+
 	async def perform_graphql(
 		self,
 		operation_name,
 		query,
 		ignore_none=False,
 		show_errors=True,
+		full_response=False,
 		**variables,
 	):
-		payload = {
-			'operationName': operation_name,
-			'query': str(query)
-		}
+		# With full_response, the whole decoded response is returned, errors
+		# and all, instead of just what's in its data
+		instrumentation = self.instrumentation
+		if instrumentation is not None:
+			start = time.perf_counter()
+		compiled = graphql.compile_query(query)
 		if ignore_none:
-			payload['variables'] = {q: variables[q] for q in variables if q is not None}
+			variables = {q: variables[q] for q in variables if q is not None}
+
+		cache = self.response_cache
+		if cache is not None and compiled.operation == 'query':
+			# Full responses are kept apart from the data of the same query
+			cache_hash = compiled.hash + '/full' if full_response else compiled.hash
+			data = cache.get(operation_name, cache_hash, variables)
+			if data is not None:
+				if instrumentation is not None:
+					instrumentation.phase(
+						operation_name, 'cache', time.perf_counter() - start
+					)
+				return data
+
+		body = self._graphql_body(operation_name, compiled, variables)
+
+		if instrumentation is None:
+			data = self.json_loads(
+				await self._send_graphql(operation_name, compiled, body)
+			)
 		else:
-			payload['variables'] = variables
-
-		async with aiohttp.ClientSession(
-			cookies={'connect.sid': self.sid},
-			headers={
-				'referer': self.default_ref,
-				'X-Requested-With': self.default_requested_with
-			}
-		) as s:
-			async with s.post(
-				base_url + '/graphql',
-				json=payload
-			) as r:
-				data = await r.json()
+			data = await self._instrumented_send(
+				instrumentation, operation_name, compiled, body, start
+			)
+		if cache is not None and compiled.operation == 'mutation':
+			cache.mutated(operation_name, variables)
+		response = data
 		if 'data' in data:
 			data = data['data']
+		if instrumentation is not None and 'errors' in response:
+			instrumentation.error(operation_name, GraphqlError(response['errors']))
+		if full_response:
+			if (
+				cache is not None and compiled.operation == 'query'
+				and 'errors' not in response
+			):
+				cache.set(operation_name, cache_hash, variables, response)
+			return response
 		if data is None:
 			if show_errors:
-				print('ERROR:', await r.json())
+				print('ERROR:', response)
 			return None
 		keys = data.keys()
 		if len(keys) == 1:
@@ -959,11 +1778,143 @@ class Client():
 
 			try:
 				loc = data[0]['locations'][0]['column']
-				print(str(query)[:loc-1] + '!!!!!' + str(query)[loc-1:])
+				document = compiled.document
+				print(document[:loc-1] + '!!!!!' + document[loc-1:])
 			except KeyError:
 				pass
+		elif cache is not None and compiled.operation == 'query' and data is not None:
+			# None can't be told apart from a miss, so things that don't exist
+			# aren't cached
+			cache.set(operation_name, cache_hash, variables, data)
+		return data
+
+	def stream_graphql(self, operation_name, query, path, **variables):
+		# Gives the items of the list at path (like ('data', 'replPosts',
+		# 'items')) in the response one at a time, as soon as each of them
+		# has arrived, instead of waiting for all of the response
+		instrumentation = self.instrumentation
+		if instrumentation is not None:
+			start = time.perf_counter()
+		compiled = graphql.compile_query(query)
+		body = self._graphql_body(operation_name, compiled, variables)
+
+		if instrumentation is None:
+			async def send(read):
+				return await self._send_graphql(operation_name, compiled, body, read)
+
+			return ItemStream(ItemParser(path, self.json_loads), send, GraphqlError)
+
+		instrumentation.phase(operation_name, 'render', time.perf_counter() - start)
+
+		# The response is decoded while it's being read, so the wire phase
+		# includes decoding it and there's no decode phase
+		async def send(read):
+			sending = time.perf_counter()
+			try:
+				result = await self._send_graphql(operation_name, compiled, body, read)
+			except Exception as e:
+				instrumentation.error(operation_name, e)
+				raise
+			instrumentation.phase(operation_name, 'wire', time.perf_counter() - sending)
+			return result
+
+		def error(response):
+			# The list wasn't in the response
+			e = GraphqlError(response)
+			instrumentation.error(operation_name, e)
+			return e
+
+		return ItemStream(ItemParser(path, self.json_loads), send, error)
+
+	def _graphql_body(self, operation_name, compiled, variables):
+		return b''.join((
+			b'{"operationName":', json.dumps(operation_name).encode(),
+			b',"query":', compiled.encoded,
+			b',"variables":', json.dumps(variables).encode(),
+			b'}'
+		))
+
+	async def _instrumented_send(
+		self, instrumentation, operation_name, compiled, body, start
+	):
+		sending = time.perf_counter()
+		instrumentation.phase(operation_name, 'render', sending - start)
+		try:
+			raw = await self._send_graphql(operation_name, compiled, body)
+		except Exception as e:
+			instrumentation.error(operation_name, e)
+			raise
+		received = time.perf_counter()
+		instrumentation.phase(operation_name, 'wire', received - sending)
+		data = self.json_loads(raw)
+		instrumentation.phase(operation_name, 'decode', time.perf_counter() - received)
 		return data
 
+	async def _send_graphql(self, operation_name, compiled, body, read=None):
+		# Returns the body of the response as bytes, or what read(response)
+		# returns if it's given
+		s = self._get_session()
+		instrumentation = self.instrumentation
+		rate_limiter = self.rate_limiter
+		retry_policy = self.retry_policy
+		is_mutation = compiled.operation == 'mutation'
+		reading = False
+		attempt = 0
+		while True:
+			try:
+				async with self.scheduler.slot(compiled.operation):
+					if rate_limiter is not None:
+						await rate_limiter.acquire(operation_name, is_mutation)
+					async with s.post(
+						base_url + '/graphql',
+						data=body,
+						cookies={'connect.sid': self.sid} if self.sid else None,
+						headers={
+							'content-type': 'application/json',
+							'referer': self.default_ref,
+							'X-Requested-With': self.default_requested_with
+						}
+					) as r:
+						if r.status == 429 and rate_limiter is not None:
+							rate_limiter.throttled()
+						can_retry = (
+							attempt < retry_policy.retries
+							and r.status in retry_policy.statuses
+							and (r.status == 429 or not is_mutation)
+						)
+						if not can_retry and r.status not in retry_policy.statuses:
+							if rate_limiter is not None and r.status < 400:
+								rate_limiter.succeeded()
+							if read is not None:
+								if instrumentation is not None:
+									instrumentation.response(
+										operation_name, r.status, len(body), r.content_length or 0
+									)
+								reading = True
+								return await read(r)
+							raw = await r.read()
+							if instrumentation is not None:
+								instrumentation.response(
+									operation_name, r.status, len(body), len(raw)
+								)
+							return raw
+						if instrumentation is not None:
+							instrumentation.response(
+								operation_name, r.status, len(body), r.content_length or 0
+							)
+						if not can_retry:
+							# Out of retries
+							r.raise_for_status()
+						delay = retry_policy.delay(attempt, r.headers.get('Retry-After'))
+			except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+				# Whatever read already got from the response can't be taken
+				# back, so it isn't retried
+				if is_mutation or reading or attempt >= retry_policy.retries:
+					raise
+				delay = retry_policy.delay(attempt)
+			attempt += 1
+			await retry_policy.wait(delay)
+
 	async def login(self, username, password):
 		if username.lower() not in whitelisted_bots:
 			raise NotWhitelisted(
@@ -971,26 +1922,25 @@ class Client():
 				'Please ask mat#6207 if you would like to be added to the whitelist.'
 			)
 
-		async with aiohttp.ClientSession(
-			headers={'referer': self.default_ref}
-		) as s:
-			async with s.post(
-				base_url + '/login',
-				json={
-					'username': username,
-					'password': password,
-					'teacher': False
-				},
-				headers={
-					'X-Requested-With': username
-				}
-			) as r:
-				if await r.text() == '{"message":"Invalid username or password."}':
-					raise InvalidLogin('Invalid username or password.')
-				# Gets the connect.sid cookie
-				connectsid = str(dict(r.cookies)['connect.sid'].value)
-				self.sid = connectsid
-			return self
+		s = self._get_session()
+		async with s.post(
+			base_url + '/login',
+			json={
+				'username': username,
+				'password': password,
+				'teacher': False
+			},
+			headers={
+				'referer': self.default_ref,
+				'X-Requested-With': username
+			}
+		) as r:
+			if await r.text() == '{"message":"Invalid username or password."}':
+				raise InvalidLogin('Invalid username or password.')
+			# Gets the connect.sid cookie
+			connectsid = str(dict(r.cookies)['connect.sid'].value)
+			self.sid = connectsid
+		return self
 
 	async def _get_reports(self, resolved):
 		reports = await self.perform_graphql(
@@ -1013,22 +1963,43 @@ class Client():
 		raw_data = await self._get_reports(resolved)
 		return ReportList(self, raw_data)
 
-	async def _get_post(self, post_id):
-		post = await self.perform_graphql(
-			'post', Queries.get_post, id=int(post_id), votesCount=100
+	async def _get_post(self, post_id, fields=None):
+		queries = post_queries(fields)
+		variables = {'votesCount': 100} if '$votesCount' in queries.variables else {}
+		post = await self.perform_batchable(
+			queries.batch_post,
+			'post', queries.get_post, id=int(post_id), **variables
 		)
 		if post is None:
 			raise PostNotFound(f'Post id {post_id} is invalid')
 		return post
 
-	async def get_post(self, post_id):
-		post = await self._get_post(post_id)
+	async def get_post(self, post_id, fields=None):
+		post = await self._get_post(post_id, fields)
 		return get_post_object(self, post)
 
+	async def get_posts_by_ids(
+		self, post_ids, chunk_size=None, concurrency=4, fields=None
+	):
+		# Posts that don't exist are None instead of raising PostNotFound
+		queries = post_queries(fields)
+		posts = await self.batcher.fetch_many(
+			queries.batch_post,
+			[(int(post_id),) for post_id in post_ids],
+			{'votesCount': 100} if '$votesCount' in queries.variables else {},
+			chunk_size=chunk_size,
+			concurrency=concurrency
+		)
+		return [
+			None if post is None else get_post_object(self, post)
+			for post in posts
+		]
+
 	async def post_exists(self, post_id):
 		if isinstance(post_id, Post):
 			post_id = post_id.id
-		post = await self.perform_graphql(
+		post = await self.perform_batchable(
+			Queries.batch_post_exists,
 			'post', Queries.post_exists, id=post_id
 		)
 		return post is not None
@@ -1072,25 +2043,128 @@ class Client():
 		return posts
 
 	async def get_user_by_id(self, user_id):
-		return User(
+		return get_user_object(
 			self,
-			await self.perform_graphql(
+			await self.perform_batchable(
+				Queries.batch_user_by_id,
 				'user',
 				Queries.get_user_by_id,
 				user_id=user_id
 			)
 		)
 
+	async def get_users_by_ids(self, user_ids, chunk_size=None, concurrency=4):
+		users = await self.batcher.fetch_many(
+			Queries.batch_user_by_id,
+			[(int(user_id),) for user_id in user_ids],
+			{},
+			chunk_size=chunk_size,
+			concurrency=concurrency
+		)
+		return [None if user is None else get_user_object(self, user) for user in users]
+
+	def get_posts(
+		self, boards=None, sort='top', search='', limit=32, after=None,
+		prefetch=0, merge=False, fields=None, stream=False
+	):
+		# Gets the posts from several boards at once. By default they're all
+		# in one feed, but with merge the boards are paginated at the same
+		# time and their posts merged together.
+		if boards is None:
+			boards = [name for name in self.boards.board_names if name != 'all']
+		slugs = [
+			board if isinstance(board, str) else board.name for board in boards
+		]
+		if sort == 'top':
+			sort = 'votes'
+		if merge and sort in ('new', 'votes'):
+			if after is not None:
+				# Every board has its own cursor, so there's no one to start at
+				raise ValueError('after can\'t be used with merge')
+			return self._merge_posts(
+				slugs, sort, search, limit, prefetch, fields, stream
+			)
+		return AsyncPostList(
+			self,
+			limit=limit,
+			sort=sort,
+			search=search,
+			after=after,
+			board=MultiBoard(self, slugs),
+			prefetch=prefetch,
+			fields=fields,
+			stream=stream
+		)
+
+	def _merge_posts(self, slugs, sort, search, limit, prefetch, fields, stream):
+		fields = post_field_names(fields)
+		if fields is not None:
+			# The posts are merged by these, so they have to be fetched
+			fields |= {'timeCreated' if sort == 'new' else 'voteCount'}
+		post_lists = [
+			MultiBoard(self, [slug]).get_posts(
+				sort=sort, search=search, limit=limit, prefetch=prefetch,
+				fields=fields, stream=stream
+			)
+			for slug in slugs
+		]
+		return MergedPostList(post_lists, sort, limit)
+
+	async def watch_posts(
+		self, boards=None, interval=10, min_interval=2, max_interval=60,
+		include_existing=False
+	):
+		# Yields new posts as they get made, forever
+		if boards is None:
+			slugs = ['all']
+		else:
+			slugs = [
+				board if isinstance(board, str) else board.name for board in boards
+			]
+
+		async def fetch(after):
+			posts = await self._posts_in_board(
+				board_slugs=slugs, order='new', after=after
+			)
+			return posts['items'], posts['pageInfo']['nextCursor']
+
+		async for post in watch_items(
+			lambda: PageReader(fetch),
+			interval=interval,
+			min_interval=min_interval,
+			max_interval=max_interval,
+			include_existing=include_existing
+		):
+			yield get_post_object(self, post)
+
+	async def watch_comments(
+		self, interval=10, min_interval=2, max_interval=60, include_existing=False
+	):
+		# Yields new comments as they get made, forever
+		async def fetch(after):
+			comments = await self._get_all_comments(order='new', after=after)
+			return comments['items'], comments['pageInfo']['nextCursor']
+
+		async for comment in watch_items(
+			lambda: PageReader(fetch),
+			interval=interval,
+			min_interval=min_interval,
+			max_interval=max_interval,
+			include_existing=include_existing
+		):
+			yield get_comment_object(self, comment, LazyPost(self, comment['post']))
+
 	async def _posts_in_board(
 		self,
 		board_slugs=None,
 		order='new',
 		search_query=None,
-		after=None
+		after=None,
+		fields=None
 	):
 		posts = await self.perform_graphql(
 			'ReplPostsFeed',
-			Queries.posts_feed,
+			post_queries(fields).posts_feed,
 			options={
 				'boardSlugs': board_slugs,
 				'order': order.title(),
@@ -1100,6 +2174,26 @@ class Client():
 		)
 		return posts
 
+	def _stream_posts_in_board(
+		self,
+		board_slugs=None,
+		order='new',
+		search_query=None,
+		after=None,
+		fields=None
+	):
+		return self.stream_graphql(
+			'ReplPostsFeed',
+			post_queries(fields).posts_feed,
+			('data', 'replPosts', 'items'),
+			options={
+				'boardSlugs': board_slugs,
+				'order': order.title(),
+				'searchQuery': search_query,
+				'after': after
+			}
+		)
+
 	class _boards:
 		board_names = ['all', 'announcements', 'challenge', 'ask', 'learn', 'share', 'templates', 'tutorials']
 		__slots__ = ['client', ] + board_names
@@ -1124,31 +2218,34 @@ class Client():
 			self.templates = self._templates(client)
 			self.tutorials = self._tutorials(client)
 
-	async def _get_comments(self, post_id, order='new'):
+	async def _get_comments(self, post_id, order='new', after=None):
 		return await self.perform_graphql(
 			'post',
 			Queries.get_comments,
 			id=post_id,
-			commentsOrder=order
+			commentsOrder=order,
+			commentsAfter=after
 		)
 
-	async def _get_user_comments(self, user_id, limit, order):
+	async def _get_user_comments(self, user_id, limit, order, after=None):
 
 		return await self.perform_graphql(
 			'ProfileComments',
 			Queries.get_user_comments,
 			user_id=user_id,
-			limit=limit,
-			commentsOrder=order
+			count=limit,
+			order=order,
+			after=after
 		)
 
-	async def _get_user_posts(self, user_id, limit, order):
+	async def _get_user_posts(self, user_id, limit, order, after=None):
 		return await self.perform_graphql(
 			'user',
 			Queries.get_user_posts,
 			user_id=user_id,
-			limit=limit,
-			order=order
+			count=limit,
+			order=order,
+			after=after
 		)
 
 	async def _get_user_repls(
@@ -1160,22 +2257,24 @@ class Client():
 			'user',
 			Queries.get_user_repls,
 			user_id=user.id,
-			limit=limit,
+			count=limit,
 			pinnedFirst=pinned_first,
 			before=before,
 			after=after,
 			direction=direction
 		)
 
-	async def _get_all_comments(self, order='new'):
+	async def _get_all_comments(self, order='new', after=None):
 		return await self.perform_graphql(
 			'comments',
 			Queries.get_all_comments,
-			order=order
+			order=order,
+			after=after
 		)
 
 	async def _get_comment(self, id):
-		return await self.perform_graphql(
+		return await self.perform_batchable(
+			Queries.batch_comment,
 			'comment',
 			Queries.get_comment,
 			id=id
@@ -1183,34 +2282,32 @@ class Client():
 
 	async def get_comment(self, id):
 		data = await self._get_comment(id)
-		post = await self.get_post(data['post']['id'])
-		return Comment(self, data, post)
+		if data is None:
+			return None
+		return get_comment_object(self, data, LazyPost(self, data['post']))
+
+	async def get_comments_by_ids(self, comment_ids, chunk_size=None, concurrency=4):
+		comments = await self.batcher.fetch_many(
+			Queries.batch_comment,
+			[(int(comment_id),) for comment_id in comment_ids],
+			{},
+			chunk_size=chunk_size,
+			concurrency=concurrency
+		)
+		return [
+			None if comment is None
+			else get_comment_object(self, comment, LazyPost(self, comment['post']))
+			for comment in comments
+		]
 
-	async def get_all_comments(self, order='new'):
-		_comments = await self._get_all_comments(order=order)
-		comments = []
-		for c in _comments['items']:
-			comments.append(Comment(
-				self,
-				id=c['id'],
-				body=c['body'],
-				time_created=c['timeCreated'],
-				can_edit=c['canEdit'],
-				can_comment=c['canComment'],
-				can_report=c['canReport'],
-				has_reported=c['hasReported'],
-				url=c['url'],
-				votes=c['voteCount'],
-				can_vote=c['canVote'],
-				has_voted=c['hasVoted'],
-				user=c['user'],
-				post=c['post'],
-				comments=c['comments']
-			))
-		return comments
+	def get_all_comments(self, order='new', limit=None, after=None, prefetch=0):
+		return AsyncCommentList(
+			self, order=order, limit=limit, after=after, prefetch=prefetch
+		)
 
 	async def _get_user(self, name):
-		user = await self.perform_graphql(
+		user = await self.perform_batchable(
+			Queries.batch_user,
 			'userByUsername',
 			Queries.get_user,
 			username=name,
@@ -1221,8 +2318,14 @@ class Client():
 		user = await self._get_user(name)
 		if user is None:
 			return None
-		u = User(
-			self,
-			user=user
+		return get_user_object(self, user)
+
+	async def get_users_by_names(self, names, chunk_size=None, concurrency=4):
+		users = await self.batcher.fetch_many(
+			Queries.batch_user,
+			[(name,) for name in names],
+			{},
+			chunk_size=chunk_size,
+			concurrency=concurrency
 		)
-		return u
+		return [None if user is None else get_user_object(self, user) for user in users]
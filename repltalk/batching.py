@@ -0,0 +1,120 @@
+import asyncio
+
+
+class Batcher():
+	# Collects the batchable requests made during one tick of the event loop
+	# and sends them together as a single aliased query
+	__slots__ = (
+		'client', 'max_size', 'error', 'pending', 'depth', 'flush_handle', 'tasks'
+	)
+
+	def __init__(self, client, max_size=25, error=Exception):
+		self.client = client
+		self.max_size = max_size
+		# Raised with the errors when a response has no data at all
+		self.error = error
+		self.pending = {}
+		self.depth = 0
+		self.flush_handle = None
+		self.tasks = set()
+
+	@property
+	def active(self):
+		return self.depth > 0
+
+	async def __aenter__(self):
+		self.depth += 1
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		self.depth -= 1
+		await self.flush()
+
+	def load(self, batch_field, variables):
+		keys = batch_field.keys
+		key = tuple(variables[name] for name in keys)
+		shared = tuple(sorted(
+			(name, value) for name, value in variables.items() if name not in keys
+		))
+		group = self.pending.setdefault((batch_field, shared), {})
+		future = group.get(key)
+		if future is None:
+			loop = asyncio.get_event_loop()
+			future = group[key] = loop.create_future()
+			if self.flush_handle is None:
+				self.flush_handle = loop.call_soon(self.dispatch)
+		return future
+
+	def dispatch(self):
+		self.flush_handle = None
+		pending = self.pending
+		self.pending = {}
+		for (batch_field, shared), group in pending.items():
+			task = asyncio.ensure_future(self.run(batch_field, dict(shared), group))
+			self.tasks.add(task)
+			task.add_done_callback(self.tasks.discard)
+
+	async def flush(self):
+		if self.flush_handle is not None:
+			self.flush_handle.cancel()
+			self.dispatch()
+		if self.tasks:
+			await asyncio.gather(*self.tasks, return_exceptions=True)
+
+	async def run(self, batch_field, shared, group):
+		keys = list(group)
+		for i in range(0, len(keys), self.max_size):
+			chunk = keys[i:i + self.max_size]
+			try:
+				results = await self.fetch(batch_field, chunk, shared)
+			except Exception as e:
+				for key in chunk:
+					if not group[key].done():
+						group[key].set_exception(e)
+				continue
+			for key, result in zip(chunk, results):
+				if not group[key].done():
+					group[key].set_result(result)
+
+	async def fetch_many(
+		self, batch_field, keys, shared, chunk_size=None, concurrency=4
+	):
+		# Fetches all of the keys in as few requests as possible, with at most
+		# concurrency requests running at once
+		chunk_size = chunk_size or self.max_size
+		unique_keys = list(dict.fromkeys(keys))
+		chunks = [
+			unique_keys[i:i + chunk_size]
+			for i in range(0, len(unique_keys), chunk_size)
+		]
+		semaphore = asyncio.Semaphore(concurrency)
+
+		async def fetch_chunk(chunk):
+			async with semaphore:
+				return await self.fetch(batch_field, chunk, shared)
+
+		results = {}
+		chunk_results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+		for chunk, chunk_result in zip(chunks, chunk_results):
+			results.update(zip(chunk, chunk_result))
+		return [results[key] for key in keys]
+
+	async def fetch(self, batch_field, keys, shared):
+		# Returns the results for each of the keys, in the same order
+		variables = dict(shared)
+		names = batch_field.keys
+		for i, key in enumerate(keys):
+			for name, value in zip(names, key):
+				variables[f'{name}{i}'] = value
+		response = await self.client.perform_graphql(
+			batch_field.operation_name,
+			batch_field.query(len(keys)),
+			full_response=True,
+			**variables
+		)
+		data = response.get('data')
+		if data is None:
+			# The whole request failed, which isn't the same as the things
+			# not existing
+			raise self.error(response.get('errors'))
+		return [data.get(f'_{i}') for i in range(len(keys))]
@@ -0,0 +1,259 @@
+from collections import OrderedDict
+import json
+import time
+
+
+class cached_slot():
+	# Like functools.cached_property, but for classes with __slots__. The
+	# value is worked out the first time it's used and then kept in the slot
+	# with the same name starting with an underscore.
+	__slots__ = ('func', 'slot')
+
+	def __init__(self, func):
+		self.func = func
+		self.slot = None
+
+	def __set_name__(self, owner, name):
+		self.slot = owner.__dict__['_' + name]
+
+	def __get__(self, instance, owner=None):
+		if instance is None:
+			return self
+		try:
+			return self.slot.__get__(instance, owner)
+		except AttributeError:
+			value = self.func(instance)
+			self.slot.__set__(instance, value)
+			return value
+
+	def __set__(self, instance, value):
+		self.slot.__set__(instance, value)
+
+	def __delete__(self, instance):
+		try:
+			self.slot.__delete__(instance)
+		except AttributeError:
+			pass
+
+
+_cached_slots = {}
+
+
+def reset_cached_slots(obj):
+	# Makes the cached_slots of an object be worked out again
+	cls = type(obj)
+	slots = _cached_slots.get(cls)
+	if slots is None:
+		slots = _cached_slots[cls] = [
+			value for klass in cls.__mro__ for value in vars(klass).values()
+			if isinstance(value, cached_slot)
+		]
+	for slot in slots:
+		slot.__delete__(obj)
+
+
+def richer(old, new):
+	# Whichever of two things an object was made with says more: an object
+	# over an id or None, and otherwise the one with more data
+	if new is None:
+		return old
+	if old is None:
+		return new
+	old_data = getattr(old, 'data', None)
+	new_data = getattr(new, 'data', None)
+	if new_data is None:
+		return new if old_data is None else old
+	if old_data is None:
+		return new
+	return new if len(new_data) >= len(old_data) else old
+
+
+def merge_args(old_data, data, old_args, args):
+	# The arguments to make an object again with, when newer data for it
+	# arrives, or None if nothing changed. Data that has fewer fields (like
+	# a reply that's only an id) never removes the fields that are already
+	# known, and an argument is never swapped for one that says less.
+	if data is old_data and args == old_args:
+		return None
+	merged = {**old_data, **data}
+	changed = merged != old_data
+	new_args = []
+	for old_arg, arg in zip(old_args, args):
+		if arg is data:
+			new_args.append(merged if changed else old_data)
+			continue
+		arg = richer(old_arg, arg)
+		if arg is not old_arg:
+			changed = True
+		new_args.append(arg)
+	return new_args if changed else None
+
+
+class IdentityMap():
+	# Keeps one object per type and id, so the same user or board that shows
+	# up over and over again in a feed only gets made once. Objects are
+	# updated in place when newer data for them arrives, keeping whatever the
+	# new data doesn't have.
+	__slots__ = ('max_size', 'ttl', 'entries', 'hits', 'misses')
+
+	def __init__(self, max_size=4096, ttl=None):
+		self.max_size = max_size
+		self.ttl = ttl
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		return len(self.entries)
+
+	def get(self, cls, data, args):
+		key = (cls, data['id'])
+		entry = self.entries.get(key)
+		now = time.monotonic() if self.ttl is not None else None
+		if entry is not None:
+			obj, expires, old_args = entry
+			if expires is None or expires > now:
+				self.hits += 1
+				self.entries.move_to_end(key)
+				new_args = merge_args(obj.data, data, old_args, args)
+				if new_args is not None:
+					obj.__init__(*new_args)
+					reset_cached_slots(obj)
+					self.entries[key] = (obj, expires, new_args)
+				return obj
+		self.misses += 1
+		obj = cls(*args)
+		self.entries[key] = (obj, None if now is None else now + self.ttl, args)
+		self.entries.move_to_end(key)
+		if len(self.entries) > self.max_size:
+			self.entries.popitem(last=False)
+		return obj
+
+	def clear(self):
+		self.entries.clear()
+
+
+def response_tags(operation_name, variables):
+	# What a cached response contains, so mutations can find what they affect
+	tags = [(operation_name,)]
+	if operation_name in ('post', 'comment') and 'id' in variables:
+		tags.append((operation_name, variables['id']))
+	elif operation_name == 'userByUsername':
+		tags.append(('user', variables.get('username')))
+	elif operation_name in ('user', 'ProfileComments'):
+		tags.append(('user', variables.get('user_id')))
+	return tags
+
+
+def mutation_tags(operation_name, variables):
+	# What a mutation makes stale
+	if operation_name == 'deletePost':
+		return [('post', variables.get('id')), ('ReplPostsFeed',)]
+	elif operation_name == 'deleteComment':
+		# Comments are included in posts, so those have to go too
+		return [
+			('comment', variables.get('id')), ('post',), ('ProfileComments',)
+		]
+	elif operation_name == 'createComment':
+		comment_input = variables.get('input') or {}
+		return [
+			('post', comment_input.get('postId')),
+			('comment', comment_input.get('commentId'))
+		]
+	elif operation_name in ('resolveBoardReport', 'createBoardReport'):
+		return [('boardReports',)]
+	elif operation_name == 'Mutation':
+		return [('userByUsername',)]
+	return []
+
+
+class ResponseCache():
+	# Caches the responses of read only queries for a short time. Anything
+	# with a get, set and mutated method like this one can be used instead.
+	__slots__ = (
+		'max_size', 'ttls', 'entries', 'tagged', 'hits', 'misses'
+	)
+
+	default_ttls = {
+		'post': 10,
+		'comment': 10,
+		'userByUsername': 30,
+		'user': 30,
+		'ProfileComments': 30,
+		'leaderboard': 60,
+		'boardReports': 5,
+		'ReplPostsFeed': 5,
+	}
+
+	def __init__(self, max_size=1024, ttls=None):
+		self.max_size = max_size
+		self.ttls = dict(self.default_ttls)
+		if ttls:
+			self.ttls.update(ttls)
+		self.entries = OrderedDict()
+		self.tagged = {}
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		return len(self.entries)
+
+	def key(self, operation_name, query_hash, variables):
+		return (
+			operation_name,
+			query_hash,
+			json.dumps(variables, sort_keys=True, separators=(',', ':'))
+		)
+
+	def get(self, operation_name, query_hash, variables):
+		if operation_name not in self.ttls:
+			return None
+		key = self.key(operation_name, query_hash, variables)
+		entry = self.entries.get(key)
+		if entry is None:
+			self.misses += 1
+			return None
+		data, expires, tags = entry
+		if expires <= time.monotonic():
+			self.remove(key)
+			self.misses += 1
+			return None
+		self.entries.move_to_end(key)
+		self.hits += 1
+		return data
+
+	def set(self, operation_name, query_hash, variables, data):
+		ttl = self.ttls.get(operation_name)
+		if ttl is None:
+			return
+		key = self.key(operation_name, query_hash, variables)
+		self.remove(key)
+		tags = response_tags(operation_name, variables)
+		self.entries[key] = (data, time.monotonic() + ttl, tags)
+		for tag in tags:
+			self.tagged.setdefault(tag, set()).add(key)
+		if len(self.entries) > self.max_size:
+			self.remove(next(iter(self.entries)))
+
+	def mutated(self, operation_name, variables):
+		for tag in mutation_tags(operation_name, variables):
+			self.invalidate(tag)
+
+	def invalidate(self, tag):
+		for key in list(self.tagged.get(tag, ())):
+			self.remove(key)
+
+	def remove(self, key):
+		entry = self.entries.pop(key, None)
+		if entry is None:
+			return
+		for tag in entry[2]:
+			keys = self.tagged.get(tag)
+			if keys is not None:
+				keys.discard(key)
+				if not keys:
+					del self.tagged[tag]
+
+	def clear(self):
+		self.entries.clear()
+		self.tagged.clear()
@@ -0,0 +1,140 @@
+import json
+import sys
+from array import array
+from datetime import datetime, timezone
+
+from repltalk.timestamps import parse_timestamp
+
+# Feeds as columns of numbers instead of objects, for analytics. The raw
+# items are read straight into arrays, so no Posts, Users or Boards are made.
+# Anything that's missing (like the author of a deleted account) is -1, and
+# timestamps are milliseconds since 1970.
+
+epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+missing = -1
+
+# The start of files made by Columns.write
+file_magic = b'REPLTALKCOLS1\n'
+
+
+def timestamp_ms(timestamp):
+	parsed = parse_timestamp(timestamp)
+	if parsed is None:
+		return missing
+	delta = parsed - epoch
+	return (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
+
+def nested_id(item, key):
+	value = item.get(key)
+	if value is None:
+		return missing
+	return int(value['id'])
+
+
+def count(key):
+	def get(item):
+		value = item.get(key)
+		return missing if value is None else value
+	return get
+
+
+# The name, array typecode and getter of every column. q is a signed 64 bit
+# int.
+post_columns = (
+	('id', 'q', lambda item: int(item['id'])),
+	('votes', 'q', count('voteCount')),
+	('comments', 'q', count('commentCount')),
+	('time_created', 'q', lambda item: timestamp_ms(item.get('timeCreated'))),
+	('author_id', 'q', lambda item: nested_id(item, 'user')),
+	('board_id', 'q', lambda item: nested_id(item, 'board')),
+)
+
+comment_columns = (
+	('id', 'q', lambda item: int(item['id'])),
+	('votes', 'q', count('voteCount')),
+	('time_created', 'q', lambda item: timestamp_ms(item.get('timeCreated'))),
+	('author_id', 'q', lambda item: nested_id(item, 'user')),
+	('post_id', 'q', lambda item: nested_id(item, 'post')),
+	('parent_id', 'q', lambda item: nested_id(item, 'parentComment')),
+)
+
+# The fields of posts the post columns need, so exports don't ask for more
+post_column_fields = (
+	'id', 'voteCount', 'commentCount', 'timeCreated', 'user', 'board'
+)
+
+
+class Columns():
+	# A dict of array.arrays that all have the same length, one for each
+	# column
+	__slots__ = ('typecodes', 'arrays', 'getters')
+
+	def __init__(self, columns):
+		self.typecodes = {name: typecode for name, typecode, _ in columns}
+		self.arrays = {name: array(typecode) for name, typecode, _ in columns}
+		self.getters = [
+			(self.arrays[name].append, get) for name, _, get in columns
+		]
+
+	def extend(self, items):
+		for append, get in self.getters:
+			for item in items:
+				append(get(item))
+
+	def __getitem__(self, name):
+		return self.arrays[name]
+
+	def __iter__(self):
+		return iter(self.arrays)
+
+	def __len__(self):
+		for column in self.arrays.values():
+			return len(column)
+		return 0
+
+	def keys(self):
+		return self.arrays.keys()
+
+	def to_numpy(self):
+		# NumPy isn't needed for anything else, so it's only imported here
+		import numpy
+		return {
+			name: numpy.frombuffer(column, dtype=column.typecode)
+			for name, column in self.arrays.items()
+		}
+
+	def write(self, file):
+		# Writes the columns to a file (or a path) as a small JSON header and
+		# then every column's values, little endian
+		if isinstance(file, str):
+			with open(file, 'wb') as f:
+				return self.write(f)
+		header = json.dumps({
+			'length': len(self),
+			'columns': [[name, code] for name, code in self.typecodes.items()],
+		}).encode()
+		file.write(file_magic)
+		file.write(len(header).to_bytes(4, 'little'))
+		file.write(header)
+		for column in self.arrays.values():
+			if sys.byteorder == 'big':
+				column = array(column.typecode, column)
+				column.byteswap()
+			file.write(column.tobytes())
+
+
+def read_columns(file):
+	# Reads columns made by Columns.write
+	if isinstance(file, str):
+		with open(file, 'rb') as f:
+			return read_columns(f)
+	if file.read(len(file_magic)) != file_magic:
+		raise ValueError('Not a columns file')
+	header = json.loads(file.read(int.from_bytes(file.read(4), 'little')))
+	columns = Columns([(name, code, None) for name, code in header['columns']])
+	for name, column in columns.arrays.items():
+		column.frombytes(file.read(header['length'] * column.itemsize))
+		if sys.byteorder == 'big':
+			column.byteswap()
+	return columns
@@ -1,3 +1,8 @@
+import hashlib
+import json
+import re
+
+
 def builtin_to_graphql(item):
 	if isinstance(item, list) or isinstance(item, tuple) or isinstance(item, set):
 		value = Field(*item)
@@ -8,29 +13,81 @@ def builtin_to_graphql(item):
 	return value
 
 
+def create_args_string(args):
+	if not args:
+		return ''
+	return '(' + ','.join(f'{arg_key}:{args[arg_key]}' for arg_key in args) + ')'
+
+
+# The serializer writes everything into one list that gets joined at the
+# end, instead of every field building and concatenating its own string
+
+def write_value(value, out):
+	# Same output as str(builtin_to_graphql(value)) without making new Fields
+	if isinstance(value, (list, tuple, set)):
+		write_items(value, '', out)
+	elif isinstance(value, dict):
+		write_items((value,), '', out)
+	elif isinstance(value, (Field, Alias, Fragment)):
+		value.write(out)
+	else:
+		out.append(str(value))
+
+
+def write_items(items, args_string, out):
+	first = True
+	for item in items:
+		if first:
+			first = False
+		else:
+			out.append(' ')
+		if isinstance(item, str):
+			out.append(item)
+			out.append(args_string)
+		elif isinstance(item, (Field, Alias)):
+			item.write(out)
+			out.append(args_string)
+		elif isinstance(item, (list, tuple)):
+			write_value(item, out)
+			out.append(args_string)
+		elif isinstance(item, Fragment):
+			item.write(out)
+		else:
+			for field in item:
+				if isinstance(field, str):
+					out.append(field)
+				else:
+					write_value(field, out)
+				out.append(args_string)
+				out.append('{')
+				write_value(item[field], out)
+				out.append('}')
+
+
 class Alias():
+	__slots__ = ('alias', 'field')
+
 	def __init__(self, alias, field):
 		self.alias = alias
 		self.field = field
 
-	def __repr__(self):
-		return f'{self.alias}: {self.field}'
-
+	def write(self, out):
+		out.append(self.alias)
+		out.append(': ')
+		if isinstance(self.field, (Field, Alias, Fragment)):
+			self.field.write(out)
+		else:
+			out.append(str(self.field))
 
-def create_args_string(args):
-	output = ''
-	if args != {}:
-		args_tmp = []
-		for arg_key in args:
-			arg_value = args[arg_key]
-			args_tmp.append(f'{arg_key}:{arg_value}')
-		output += '('
-		output += ','.join(args_tmp)
-		output += ')'
-	return output
+	def __repr__(self):
+		out = []
+		self.write(out)
+		return ''.join(out)
 
 
 class Field():
+	__slots__ = ('data', 'args', 'args_string')
+
 	def __init__(self, *args, **kwargs):
 		if 'name' in kwargs:
 			self.data = ({kwargs['name']: kwargs['data']},)
@@ -39,78 +96,197 @@ class Field():
 		else:
 			self.data = args or (kwargs.get('data'),)
 		self.args = kwargs.get('args', {})
-		# if 'name' not in kwargs and self.args == {}:
-		# 	self.args = kwargs
+		self.args_string = create_args_string(self.args)
+
+	def write(self, out):
+		write_items(self.data, self.args_string, out)
 
 	def __str__(self):
-		output = ''
-
-		for item in self.data:
-			if isinstance(item, str):
-				output += item
-				output += create_args_string(self.args)
-			elif isinstance(item, Field):
-				output += str(item)
-				output += create_args_string(self.args)
-			elif isinstance(item, Alias):
-				output += str(item)
-				output += create_args_string(self.args)
-			elif isinstance(item, list) or isinstance(item, tuple):
-				item_as_graphql = str(builtin_to_graphql(item))
-				output += item_as_graphql
-				output += create_args_string(self.args)
-			elif isinstance(item, Fragment):
-				output += item.added_fragment()
-			else:
-				for field in item:
-					value = item[field]
-					value = builtin_to_graphql(value)
-					output += str(field)
-					output += create_args_string(self.args)
-
-					output += '{'
-					output += str(value)
-					output += '}'
-			output += ' '
-		if output.endswith(' '):
-			output = output[:-1]
-		return output
+		out = []
+		self.write(out)
+		return ''.join(out)
 
 	def __repr__(self):
 		return self.__str__()
 
+
 class Query():
+	__slots__ = ('field', 'frags')
+
 	def __init__(self, name, args, data, fragments=[]):
 		self.field = Field({name: data}, args=args)
 		self.frags = fragments
 
 	def __str__(self):
-		output = 'query ' + str(self.field)
+		out = ['query ']
+		self.field.write(out)
 		for frag in self.frags:
-			str_frag = frag.fragment_string()
-			output += str_frag
-		return output
+			frag.write_definition(out)
+		return ''.join(out)
 
 
 class Mutation():
+	__slots__ = ('field',)
+
 	def __init__(self, name, args, data):
 		self.field = Field({name: data}, args=args)
 
 	def __str__(self):
-		return 'mutation ' + str(self.field)
+		out = ['mutation ']
+		self.field.write(out)
+		return ''.join(out)
 
 
 class Fragment():
+	__slots__ = ('name', 'adding_to_name', 'field')
+
 	def __init__(self, fragment_name, adding_to_name, data):
 		self.name = fragment_name
 		self.adding_to_name = adding_to_name
 		self.field = Field(data)
 
+	def write_definition(self, out):
+		out.append(f'fragment {self.name} on {self.adding_to_name} {{')
+		self.field.write(out)
+		out.append('}')
+
+	def write(self, out):
+		out.append('...')
+		out.append(self.name)
+
 	def fragment_string(self):
-		return f'fragment {self.name} on {self.adding_to_name} { {self.field} }'
+		out = []
+		self.write_definition(out)
+		return ''.join(out)
 
 	def added_fragment(self):
 		return f'...{self.name}'
 
 	def __str__(self):
 		return self.added_fragment()
+
+
+class BatchField():
+	# A root field that can be repeated under different aliases so that
+	# several requests for it can be sent in one query
+	__slots__ = ('name', 'args', 'data', 'variables', 'operation_name', 'queries')
+
+	def __init__(self, name, args, data, variables):
+		self.name = name
+		self.args = args
+		self.data = data
+		self.variables = variables
+		self.operation_name = name + 'Batch'
+		self.queries = {}
+
+	@property
+	def keys(self):
+		# The variables that are different for every aliased field
+		return tuple(variable[1:] for variable in self.args.values())
+
+	def query(self, count):
+		query = self.queries.get(count)
+		if query is not None:
+			return query
+		variables = {
+			name: variable_type for name, variable_type in self.variables.items()
+			if name not in self.args.values()
+		}
+		fields = []
+		for i in range(count):
+			field_args = {}
+			for arg, variable in self.args.items():
+				variables[f'{variable}{i}'] = self.variables[variable]
+				field_args[arg] = f'{variable}{i}'
+			fields.append(Alias(f'_{i}', Field({self.name: self.data}, args=field_args)))
+		query = Query(self.operation_name, variables, Field(*fields))
+		self.queries[count] = query
+		return query
+
+
+def field_name(item):
+	# The name of the field that an item in a selection is for
+	if isinstance(item, str):
+		return item
+	elif isinstance(item, Alias):
+		return item.alias
+	elif isinstance(item, Field):
+		if len(item.data) == 1:
+			return field_name(item.data[0])
+	elif isinstance(item, dict) and len(item) == 1:
+		return field_name(next(iter(item)))
+	return None
+
+
+def selection(field):
+	items = []
+	for item in field.data:
+		if isinstance(item, (list, tuple)):
+			items.extend(item)
+		else:
+			items.append(item)
+	return items
+
+
+def project(field, names):
+	# A copy of a field that only selects the fields with those names
+	names = set(names)
+	items = tuple(item for item in selection(field) if field_name(item) in names)
+	unknown = names - {field_name(item) for item in items}
+	if unknown:
+		raise ValueError('Unknown fields: ' + ', '.join(sorted(unknown)))
+	return Field(items, args=field.args)
+
+
+def without(field, names):
+	# A copy of a field that selects everything except the fields with those
+	# names
+	names = set(names)
+	return Field(
+		tuple(item for item in selection(field) if field_name(item) not in names),
+		args=field.args
+	)
+
+
+def used_variables(variables, field):
+	# Only the variables that the field uses, since declaring ones that
+	# aren't used is an error
+	document = str(field)
+	return {
+		name: variable_type for name, variable_type in variables.items()
+		if re.search(re.escape(name) + r'\b', document)
+	}
+
+
+class CompiledQuery():
+	__slots__ = ('document', 'hash', 'encoded', 'operation')
+
+	def __init__(self, document):
+		self.document = document
+		self.hash = hashlib.sha256(document.encode()).hexdigest()
+		if document.lstrip().startswith('mutation'):
+			self.operation = 'mutation'
+		else:
+			self.operation = 'query'
+		# The document already encoded as a JSON string, so it can be put
+		# directly into request bodies without being escaped every time
+		self.encoded = json.dumps(document).encode()
+
+	def __str__(self):
+		return self.document
+
+
+_compiled_queries = {}
+
+
+def compile_query(query):
+	# Queries are rendered once and then reused for every request
+	try:
+		return _compiled_queries[query]
+	except KeyError:
+		pass
+	if isinstance(query, CompiledQuery):
+		return query
+	compiled = CompiledQuery(str(query))
+	_compiled_queries[query] = compiled
+	return compiled
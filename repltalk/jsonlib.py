@@ -0,0 +1,9 @@
+# The fastest JSON decoder that's installed, which Clients use unless
+# they're given another one. They all take the response body as bytes.
+try:
+	from orjson import loads as json_loads
+except ImportError:
+	try:
+		from ujson import loads as json_loads
+	except ImportError:
+		from json import loads as json_loads
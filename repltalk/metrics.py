@@ -0,0 +1,143 @@
+from bisect import bisect_left
+
+# The phases of a request that are timed. Cache is a call answered by the
+# response cache instead, and construct is timed for every object that's
+# made, under the name of its class instead of an operation.
+phases = ('render', 'wire', 'decode', 'cache', 'construct')
+
+
+class Instrumentation():
+	# Gets told what every request does. Override whichever of these are
+	# needed; anything with the same methods can be used instead.
+	__slots__ = ()
+
+	def phase(self, name, phase, seconds):
+		pass
+
+	def response(self, operation_name, status, request_size, response_size):
+		pass
+
+	def error(self, operation_name, error):
+		pass
+
+
+class Histogram():
+	# Counts values into buckets that double in size, so it takes the same
+	# amount of memory however many values are added. Percentiles are the
+	# upper bound of the bucket they fall into.
+	__slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+	default_bounds = tuple(0.000001 * 2 ** i for i in range(28))
+
+	def __init__(self, bounds=None):
+		self.bounds = bounds or self.default_bounds
+		self.counts = [0] * (len(self.bounds) + 1)
+		self.count = 0
+		self.total = 0
+		self.max = 0
+
+	def add(self, value):
+		self.counts[bisect_left(self.bounds, value)] += 1
+		self.count += 1
+		self.total += value
+		if value > self.max:
+			self.max = value
+
+	def percentile(self, percent):
+		if not self.count:
+			return 0
+		rank = self.count * percent / 100
+		seen = 0
+		for i, count in enumerate(self.counts):
+			seen += count
+			if seen >= rank and count:
+				if i < len(self.bounds):
+					return min(self.bounds[i], self.max)
+				return self.max
+		return self.max
+
+	def to_dict(self):
+		return {
+			'count': self.count,
+			'total': self.total,
+			'mean': self.total / self.count if self.count else 0,
+			'p50': self.percentile(50),
+			'p90': self.percentile(90),
+			'p99': self.percentile(99),
+			'max': self.max,
+		}
+
+
+class OperationMetrics():
+	__slots__ = (
+		'requests', 'errors', 'statuses', 'request_bytes', 'response_bytes',
+		'phases'
+	)
+
+	def __init__(self):
+		self.requests = 0
+		self.errors = 0
+		self.statuses = {}
+		self.request_bytes = 0
+		self.response_bytes = 0
+		self.phases = {}
+
+	def to_dict(self):
+		# Every call renders its query once, however many times it's retried,
+		# unless it's answered by the cache
+		calls = sum(
+			self.phases[phase].count for phase in ('render', 'cache')
+			if phase in self.phases
+		)
+		return {
+			'calls': calls,
+			'requests': self.requests,
+			'errors': self.errors,
+			'error_rate': self.errors / calls if calls else 0,
+			'statuses': dict(self.statuses),
+			'request_bytes': self.request_bytes,
+			'response_bytes': self.response_bytes,
+			'phases': {
+				phase: histogram.to_dict() for phase, histogram in self.phases.items()
+			},
+		}
+
+
+class MetricsCollector(Instrumentation):
+	# Keeps counts, sizes, error rates and latency histograms for every
+	# operation in memory
+	__slots__ = ('operations',)
+
+	def __init__(self):
+		self.operations = {}
+
+	def get(self, name):
+		metrics = self.operations.get(name)
+		if metrics is None:
+			metrics = self.operations[name] = OperationMetrics()
+		return metrics
+
+	def phase(self, name, phase, seconds):
+		phases = self.get(name).phases
+		histogram = phases.get(phase)
+		if histogram is None:
+			histogram = phases[phase] = Histogram()
+		histogram.add(seconds)
+
+	def response(self, operation_name, status, request_size, response_size):
+		metrics = self.get(operation_name)
+		metrics.requests += 1
+		metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+		metrics.request_bytes += request_size
+		metrics.response_bytes += response_size
+
+	def error(self, operation_name, error):
+		self.get(operation_name).errors += 1
+
+	def export(self):
+		return {
+			name: metrics.to_dict() for name, metrics in self.operations.items()
+		}
+
+	def reset(self):
+		self.operations.clear()
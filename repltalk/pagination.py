@@ -0,0 +1,179 @@
+import asyncio
+import weakref
+
+
+def weak_method(method):
+	# Calls the method without keeping its object alive. A PageReader that's
+	# reading ahead would otherwise keep the list that owns it from ever
+	# being garbage collected, so the list couldn't close it.
+	ref = weakref.WeakMethod(method)
+
+	async def call(*args):
+		method = ref()
+		if method is None:
+			raise ReferenceError('The list was garbage collected')
+		return await method(*args)
+	return call
+
+
+class PageReader():
+	# Reads the pages of a cursor paginated list one after another. With
+	# prefetch, up to that many pages are fetched ahead in the background
+	# while the current one is being used.
+	__slots__ = (
+		'fetch', 'after', 'prefetch', 'max_items', 'fetched', 'done', 'closed',
+		'pages', 'task'
+	)
+
+	def __init__(self, fetch, after=None, prefetch=0, max_items=None):
+		# fetch(after) should return a list of items and the next cursor
+		self.fetch = fetch
+		self.after = after
+		self.prefetch = prefetch
+		self.max_items = max_items
+		self.fetched = 0
+		self.done = False
+		self.closed = False
+		self.pages = None
+		self.task = None
+
+	async def fetch_page(self, after):
+		items, next_cursor = await self.fetch(after)
+		self.fetched += len(items)
+		if (
+			not items or next_cursor is None
+			or (self.max_items is not None and self.fetched >= self.max_items)
+		):
+			self.done = True
+		return items, next_cursor
+
+	async def read_ahead(self, after):
+		try:
+			while True:
+				page = await self.fetch_page(after)
+				await self.pages.put(page)
+				if self.done:
+					break
+				after = page[1]
+		except Exception as e:
+			await self.pages.put(e)
+			return
+		await self.pages.put(None)
+
+	async def next_page(self):
+		# Returns the next list of items, or None if there aren't any more
+		if self.closed:
+			return None
+		if self.prefetch <= 0:
+			if self.done:
+				return None
+			items, self.after = await self.fetch_page(self.after)
+			return items
+		if self.task is None:
+			if self.done:
+				return None
+			self.pages = asyncio.Queue(maxsize=self.prefetch)
+			self.task = asyncio.ensure_future(self.read_ahead(self.after))
+		page = await self.pages.get()
+		if page is None:
+			self.pages.put_nowait(None)
+			return None
+		if isinstance(page, Exception):
+			self.pages.put_nowait(None)
+			raise page
+		items, self.after = page
+		return items
+
+	def close(self):
+		self.closed = True
+		if self.task is not None and not self.task.done():
+			self.task.cancel()
+
+
+async def iter_items(fetch, limit=None, after=None, prefetch=0):
+	# Yields the items from every page one at a time, stopping after limit
+	reader = PageReader(fetch, after=after, prefetch=prefetch, max_items=limit)
+	count = 0
+	try:
+		while limit is None or count < limit:
+			page = await reader.next_page()
+			if not page:
+				break
+			for item in page:
+				if limit is not None and count >= limit:
+					break
+				count += 1
+				yield item
+	finally:
+		reader.close()
+
+
+async def stream_items(open_stream, limit=None, after=None):
+	# Like iter_items, but every item is given as soon as it arrives instead
+	# of once its whole page has. open_stream(after) should return an
+	# ItemStream for the page, which has the next cursor in its pageInfo.
+	count = 0
+	while limit is None or count < limit:
+		stream = open_stream(after)
+		page_count = 0
+		try:
+			async for item in stream:
+				page_count += 1
+				count += 1
+				yield item
+				if limit is not None and count >= limit:
+					return
+		finally:
+			stream.close()
+		page = stream.page
+		after = page['pageInfo']['nextCursor']
+		if not page_count or after is None:
+			break
+
+
+async def watch_items(
+	read_pages, interval=10, min_interval=2, max_interval=60,
+	include_existing=False, max_pages=10
+):
+	# Keeps polling the newest items and only yields the ones that are newer
+	# than anything it's seen, oldest first. Ids only ever go up, so the
+	# highest one is all that has to be remembered. It polls more often
+	# while new things keep showing up and less often when they don't.
+	newest_id = None
+	# Until the first poll is done, everything is what already existed. If
+	# it didn't find anything, whatever shows up after that is new.
+	first = True
+	while True:
+		new_items = {}
+		reader = read_pages()
+		try:
+			for _ in range(max_pages):
+				page = await reader.next_page()
+				if not page:
+					break
+				reached_seen = False
+				for item in page:
+					item_id = int(item['id'])
+					if newest_id is None or item_id > newest_id:
+						new_items[item_id] = item
+					elif not item.get('isPinned'):
+						reached_seen = True
+				# The first time around, one page is enough to know where to
+				# start from
+				if first or reached_seen:
+					break
+		finally:
+			reader.close()
+
+		if new_items:
+			highest_id = max(new_items)
+			if not first or include_existing:
+				for item_id in sorted(new_items):
+					yield new_items[item_id]
+			if not first:
+				interval = max(min_interval, interval / 2)
+			newest_id = highest_id if newest_id is None else max(newest_id, highest_id)
+		else:
+			interval = min(max_interval, interval * 1.5)
+		first = False
+		await asyncio.sleep(interval)
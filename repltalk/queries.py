@@ -124,7 +124,7 @@ class Queries:
 			'items': attributes
 		})
 
-	comment_attributes = graphql.Field((
+	comment_fields = (
 		'id',
 		'body',
 		'voteCount',
@@ -132,7 +132,6 @@ class Queries:
 		'timeUpdated',
 		user_field,
 		'url',
-		{'post': 'id'},
 		{'parentComment': 'id'},
 		{'comments': 'id'},
 		'isAuthor',
@@ -152,7 +151,15 @@ class Queries:
 				'length': 150
 			}
 		)
-	))
+	)
+
+	comment_attributes = graphql.Field(comment_fields + ({'post': 'id'},))
+	# Comments that are fetched on their own come with just enough of their
+	# post to show it, instead of needing to get the whole post separately
+	lazy_post_attributes = graphql.Field('id', 'url', 'title', user_field)
+	comment_with_post_attributes = graphql.Field(
+		comment_fields + ({'post': lazy_post_attributes},)
+	)
 
 	comment_connection_field = graphql.Field(
 		'comments',
@@ -234,19 +241,20 @@ class Queries:
 		'Comment',
 		comment_attributes
 	)
+	# The variables used by post_attributes
+	post_variables = {
+		'$count': 'Int',
+		'$order': 'String',
+		'$after': 'String',
+		'$votesBefore': 'String',
+		'$votesAfter': 'String',
+		'$votesCount': 'Int',
+		'$votesOrder': 'String',
+		'$votesDirection': 'String',
+	}
 	get_post = graphql.Query(
 		'post',
-		{
-			'$id': 'Int!',
-			'$count': 'Int',
-			'$order': 'String',
-			'$after': 'String',
-			'$votesBefore': 'String',
-			'$votesAfter': 'String',
-			'$votesCount': 'Int',
-			'$votesOrder': 'String',
-			'$votesDirection': 'String',
-		},
+		{'$id': 'Int!', **post_variables},
 		graphql.Field(
 			args={'id': '$id'},
 			data={
@@ -262,7 +270,7 @@ class Queries:
 		graphql.Field(
 			args={'id': '$id'},
 			data={
-				'comment': comment_attributes
+				'comment': comment_with_post_attributes
 			}
 		)
 	)
@@ -307,17 +315,7 @@ class Queries:
 	# '''
 	posts_feed = graphql.Query(
 		'ReplPostsFeed',
-		{
-			"$options": "ReplPostsQueryOptions",			
-			'$count': 'Int',
-			'$order': 'String',
-			'$after': 'String',
-			'$votesBefore': 'String',
-			'$votesAfter': 'String',
-			'$votesCount': 'Int',
-			'$votesOrder': 'String',
-			'$votesDirection': 'String',
-		},
+		{'$options': 'ReplPostsQueryOptions', **post_variables},
 		graphql.Field(
 			name='replPosts',
 			args={
@@ -472,6 +470,10 @@ class Queries:
 		)
 	)
 
+	# The comments of posts would use the same $after and $count as the
+	# posts, so posts in a profile don't come with them
+	profile_post_attributes = graphql.without(post_attributes, ['comments'])
+
 	get_user_posts = graphql.Query(
 		'user',
 		{
@@ -498,9 +500,7 @@ class Queries:
 					},
 					data={
 						'pageInfo': 'nextCursor',
-						'items': (
-							post_attributes
-						)
+						'items': profile_post_attributes
 					}
 				)
 			}
@@ -650,38 +650,44 @@ class Queries:
 	# 		}
 	# 	}
 	# }
-	get_all_comments = '''
-	query comments($after: String, $order: String) {{
-		comments(after: $after, order: $order) {{
-			items {{
-				id
-				body
-				user {
-					username
-					id
-				}
-				comments {{
-					id
-					body
-					user {
-						username
-						id
-					}
-				}}
-			}}
-			pageInfo {{
-				hasNextPage
-				nextCursor
-			}}
-		}}
-	}}
-	'''
+	get_all_comments = graphql.Query(
+		'comments',
+		{'$after': 'String', '$order': 'String'},
+		graphql.Field(
+			'comments',
+			args={'after': '$after', 'order': '$order'},
+			data=connection_generator(comment_with_post_attributes)
+		)
+	)
 	
 	post_exists = graphql.Query('post', {'$id': 'Int!'}, {
 		graphql.Field('post', args={'id': '$id'}, data='id')
 	})
 
 
+	# Root fields that can be merged into one query by the batcher
+	batch_post = graphql.BatchField(
+		'post',
+		{'id': '$id'},
+		post_attributes,
+		{'$id': 'Int!', **post_variables}
+	)
+	batch_post_exists = graphql.BatchField(
+		'post', {'id': '$id'}, 'id', {'$id': 'Int!'}
+	)
+	batch_user = graphql.BatchField(
+		'userByUsername',
+		{'username': '$username'},
+		user_attributes,
+		{'$username': 'String!'}
+	)
+	batch_user_by_id = graphql.BatchField(
+		'user', {'id': '$user_id'}, user_attributes, {'$user_id': 'Int!'}
+	)
+	batch_comment = graphql.BatchField(
+		'comment', {'id': '$id'}, comment_with_post_attributes, {'$id': 'Int!'}
+	)
+
 # query ProfilePosts($username: String!, $after: String, $order: String, $count: Int) {  user: userByUsername(username: $username) {    id    displayName    posts(after: $after, order: $order, count: $count) {      items {        id        ...PostsFeedItemPost        board {          id          name          url          slug          color          __typename        }        __typename      }      pageInfo {        nextCursor        __typename      }      __typename    }    __typename  }}fragment PostsFeedItemPost on Post {  id  title  preview(removeMarkdown: true, length: 150)  url  commentCount  isPinned  isLocked  isAnnouncement  timeCreated  isAnswered  isAnswerable  ...PostVoteControlPost  ...PostLinkPost  user {    id    username    isHacker    image    isModerator: hasRole(role: MODERATOR)    isAdmin: hasRole(role: ADMIN)    ...UserLabelUser    ...UserLinkUser    __typename  }  repl {    id    lang {      id      icon      key      displayName      tagline      __typename    }    __typename  }  board {    id    name    slug    url    color    __typename  }  recentComments(count: 3) {    id    ...SimpleCommentComment    __typename  }  __typename}fragment PostVoteControlPost on Post {  id  voteCount  canVote  hasVoted  __typename}fragment PostLinkPost on Post {  id  url  __typename}fragment UserLabelUser on User {  id  username  karma  ...UserLinkUser  __typename}fragment UserLinkUser on User {  id  url  username  __typename}fragment SimpleCommentComment on Comment {  id  user {    id    isModerator: hasRole(role: MODERATOR)    isAdmin: hasRole(role: ADMIN)    ...UserLabelUser    ...UserLinkUser    __typename  }  preview(removeMarkdown: true, length: 500)  timeCreated  __typename}
 	profile_posts = graphql.Query('ProfilePosts', {
 		'$username': 'String!',
@@ -798,3 +804,84 @@ class Queries:
 			post { id __typename }
 			__typename }
 		'''
+
+
+# The fields of a post that each profile asks for, where None is all of them
+post_profiles = {
+	'full': None,
+	# Enough to show a post in a list
+	'slim': (
+		'id',
+		'title',
+		'url',
+		'preview',
+		'voteCount',
+		'commentCount',
+		'isPinned',
+		'isLocked',
+		'isAnnouncement',
+		'timeCreated',
+		'user',
+		'board'
+	),
+}
+
+
+class PostQueries():
+	# The queries for getting posts, only asking for some of their fields
+	__slots__ = ('fields', 'variables', 'get_post', 'batch_post', 'posts_feed')
+
+	def __init__(self, fields=None):
+		self.fields = fields
+		if fields is None:
+			self.variables = Queries.post_variables
+			self.get_post = Queries.get_post
+			self.batch_post = Queries.batch_post
+			self.posts_feed = Queries.posts_feed
+			return
+		attributes = graphql.project(Queries.post_attributes, fields)
+		variables = self.variables = graphql.used_variables(
+			Queries.post_variables, attributes
+		)
+		self.get_post = graphql.Query(
+			'post',
+			{'$id': 'Int!', **variables},
+			graphql.Field(args={'id': '$id'}, data={'post': attributes})
+		)
+		self.batch_post = graphql.BatchField(
+			'post', {'id': '$id'}, attributes, {'$id': 'Int!', **variables}
+		)
+		self.posts_feed = graphql.Query(
+			'ReplPostsFeed',
+			{'$options': 'ReplPostsQueryOptions', **variables},
+			graphql.Field(
+				name='replPosts',
+				args={'options': '$options'},
+				data=Queries.connection_generator(attributes)
+			)
+		)
+
+
+_post_queries = {None: PostQueries()}
+
+
+def post_field_names(fields):
+	# fields is either a list of the names of the fields to get or the name
+	# of a profile
+	if isinstance(fields, str):
+		try:
+			fields = post_profiles[fields]
+		except KeyError:
+			raise ValueError(f'Unknown profile: {fields}')
+	if fields is None:
+		return None
+	return frozenset(fields) | {'id'}
+
+
+def post_queries(fields=None):
+	# The queries are only made once for every set of fields
+	fields = post_field_names(fields)
+	queries = _post_queries.get(fields)
+	if queries is None:
+		queries = _post_queries[fields] = PostQueries(fields)
+	return queries
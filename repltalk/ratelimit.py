@@ -0,0 +1,134 @@
+import asyncio
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import random
+import time
+
+
+class TokenBucket():
+	__slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+	def __init__(self, rate, capacity=None):
+		self.rate = rate
+		self.capacity = capacity or max(1, rate)
+		self.tokens = self.capacity
+		self.updated = time.monotonic()
+
+	def reserve(self):
+		# Takes a token and returns how long to wait until it can be used.
+		# Tokens can go negative, which makes later callers wait their turn.
+		now = time.monotonic()
+		self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+		self.updated = now
+		self.tokens -= 1
+		if self.tokens >= 0:
+			return 0
+		return -self.tokens / self.rate
+
+
+class RateLimiter():
+	# Limits how many requests are made per second, both overall and for
+	# each operation name. The overall rate is halved whenever Repl.it says
+	# we're going too fast (at most once a second, since a burst of requests
+	# all get told at once), then slowly goes back up as requests succeed.
+	# Mutations don't wait behind the reads that are already waiting: they
+	# have a bucket of their own, and the reads after them wait longer to
+	# make up for the tokens they took, so the overall rate stays the same.
+	__slots__ = (
+		'bucket', 'mutation_bucket', 'max_rate', 'min_rate', 'operations',
+		'wait_time', 'waits', 'throttles', 'throttled_at'
+	)
+
+	def __init__(self, rate=10, burst=None, per_operation=None, min_rate=0.5):
+		self.bucket = TokenBucket(rate, burst)
+		self.mutation_bucket = TokenBucket(rate, burst)
+		self.max_rate = rate
+		self.min_rate = min_rate
+		# per_operation is a dict of operation names to (rate, burst)
+		self.operations = {
+			operation_name: TokenBucket(*limits)
+			for operation_name, limits in (per_operation or {}).items()
+		}
+		self.wait_time = 0
+		self.waits = 0
+		self.throttles = 0
+		self.throttled_at = None
+
+	async def acquire(self, operation_name, mutation=False):
+		if mutation:
+			self.bucket.reserve()
+			wait = self.mutation_bucket.reserve()
+		else:
+			wait = self.bucket.reserve()
+		operation_bucket = self.operations.get(operation_name)
+		if operation_bucket is not None:
+			wait = max(wait, operation_bucket.reserve())
+		if wait > 0:
+			self.wait_time += wait
+			self.waits += 1
+			await asyncio.sleep(wait)
+		return wait
+
+	def throttled(self):
+		self.throttles += 1
+		now = time.monotonic()
+		if self.throttled_at is not None and now - self.throttled_at < 1:
+			return
+		self.throttled_at = now
+		self.set_rate(max(self.min_rate, self.bucket.rate / 2))
+
+	def succeeded(self):
+		if self.bucket.rate < self.max_rate:
+			self.set_rate(min(self.max_rate, self.bucket.rate + self.max_rate / 100))
+
+	def set_rate(self, rate):
+		self.bucket.rate = rate
+		self.mutation_bucket.rate = rate
+
+
+def parse_retry_after(retry_after):
+	# Retry-After is either a number of seconds or an HTTP date
+	if retry_after is None:
+		return None
+	try:
+		return max(0, float(retry_after))
+	except ValueError:
+		pass
+	try:
+		retry_at = parsedate_to_datetime(retry_after)
+	except (TypeError, ValueError):
+		return None
+	return max(0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy():
+	# Retries requests that failed because of rate limits, server errors
+	# or connection problems, waiting a random amount of time that grows
+	# exponentially (or as long as Retry-After says) between attempts.
+	# Mutations are only retried when they were rate limited, since
+	# otherwise they might have already gone through.
+	__slots__ = (
+		'retries', 'backoff', 'max_backoff', 'statuses', 'retry_count', 'wait_time'
+	)
+
+	def __init__(
+		self, retries=3, backoff=0.5, max_backoff=30,
+		statuses=(429, 500, 502, 503, 504)
+	):
+		self.retries = retries
+		self.backoff = backoff
+		self.max_backoff = max_backoff
+		self.statuses = statuses
+		self.retry_count = 0
+		self.wait_time = 0
+
+	def delay(self, attempt, retry_after=None):
+		retry_after = parse_retry_after(retry_after)
+		if retry_after is not None:
+			return retry_after
+		return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+	async def wait(self, delay):
+		self.retry_count += 1
+		self.wait_time += delay
+		await asyncio.sleep(delay)
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+
+class Scheduler():
+	# Gives queries and mutations separate limits on how many of them can be
+	# running at once, so a moderation action like deleting a post doesn't
+	# have to wait behind every read that's queued up during a big scan.
+	__slots__ = ('limits', 'semaphores', 'loop', 'waiting', 'wait_time')
+
+	def __init__(self, queries=8, mutations=4):
+		self.limits = {'query': queries, 'mutation': mutations}
+		# Made for the loop that's running, and made again if the client is
+		# used from another one, since semaphores can only be used from one
+		self.semaphores = None
+		self.loop = None
+		self.waiting = {'query': 0, 'mutation': 0}
+		self.wait_time = {'query': 0, 'mutation': 0}
+
+	def slot(self, operation):
+		loop = asyncio.get_running_loop()
+		if self.loop is not loop:
+			self.loop = loop
+			self.semaphores = {
+				kind: asyncio.Semaphore(limit) for kind, limit in self.limits.items()
+			}
+		return SchedulerSlot(self.semaphores[operation], self, operation)
+
+
+class SchedulerSlot():
+	__slots__ = ('semaphore', 'scheduler', 'operation')
+
+	def __init__(self, semaphore, scheduler, operation):
+		self.semaphore = semaphore
+		self.scheduler = scheduler
+		self.operation = operation
+
+	async def __aenter__(self):
+		scheduler = self.scheduler
+		semaphore = self.semaphore
+		if semaphore.locked():
+			scheduler.waiting[self.operation] += 1
+			start = time.perf_counter()
+			try:
+				await semaphore.acquire()
+			finally:
+				scheduler.waiting[self.operation] -= 1
+			scheduler.wait_time[self.operation] += time.perf_counter() - start
+		else:
+			await semaphore.acquire()
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		self.semaphore.release()
@@ -0,0 +1,171 @@
+import asyncio
+import re
+
+# A string (which might not have finished arriving yet) with the colon
+# after it if it's a key, or a bracket
+token_pattern = re.compile(rb'"((?:[^"\\]|\\.)*)(")?(\s*:)?|[{}\[\]]')
+whitespace_pattern = re.compile(rb'\s*')
+
+
+class ItemParser():
+	# Finds the list at path in a JSON document that arrives a chunk at a
+	# time, and decodes each item in it as soon as all of the item has
+	# arrived. The rest of the document is kept with the list left empty,
+	# so it can be decoded at the end.
+	__slots__ = (
+		'path', 'json_loads', 'buffer', 'pos', 'keys', 'key', 'depth',
+		'item_start', 'rest', 'state'
+	)
+
+	def __init__(self, path, json_loads):
+		# The document itself doesn't have a key
+		self.path = [None, *path]
+		self.json_loads = json_loads
+		self.buffer = bytearray()
+		self.pos = 0
+		# The key of every object and list the parser is in
+		self.keys = []
+		self.key = None
+		# How deep into the current item the parser is
+		self.depth = 0
+		self.item_start = None
+		self.rest = bytearray()
+		# Whether it's before, in or after the list
+		self.state = 'before'
+
+	def feed(self, chunk):
+		# Returns the items that were finished by this chunk
+		buffer = self.buffer
+		buffer += chunk
+		items = []
+		pos = self.pos
+		length = len(buffer)
+		while self.state != 'after':
+			match = token_pattern.search(buffer, pos)
+			if match is None:
+				pos = length
+				break
+			token = match.group()
+			if token[0] == 34:  # "
+				if match.group(2) is None or (
+					match.group(3) is None and self.state == 'before'
+					and whitespace_pattern.match(buffer, match.end()).end() == length
+				):
+					# The rest of the string, or the colon after it, hasn't
+					# arrived yet
+					pos = match.start()
+					break
+				if match.group(3) is not None and self.state == 'before':
+					self.key = match.group(1).decode()
+				pos = match.end()
+				continue
+			pos = match.end()
+			if self.state == 'before':
+				if token in b'{[':
+					self.keys.append(self.key)
+					self.key = None
+					if token == b'[' and self.keys == self.path:
+						self.state = 'in'
+						self.rest += buffer[:pos]
+						del buffer[:pos]
+						length = len(buffer)
+						pos = 0
+				else:
+					self.keys.pop()
+			elif token in b'{[':
+				if self.depth == 0:
+					self.item_start = match.start()
+				self.depth += 1
+			elif self.depth == 0:
+				# The end of the list
+				self.state = 'after'
+				pos = match.start()
+			else:
+				self.depth -= 1
+				if self.depth == 0:
+					items.append(self.json_loads(bytes(buffer[self.item_start:pos])))
+					self.item_start = None
+		if self.state == 'in':
+			# Everything before the item that's still arriving isn't needed
+			start = self.item_start if self.item_start is not None else pos
+			del buffer[:start]
+			if self.item_start is not None:
+				self.item_start = 0
+			pos -= start
+		self.pos = pos
+		return items
+
+	def finish(self):
+		# Decodes everything except for the list
+		if self.state == 'before':
+			return self.json_loads(bytes(self.rest + self.buffer))
+		return self.json_loads(bytes(self.rest + self.buffer[self.pos:]))
+
+
+class ItemStream():
+	# The items of a list in a response, given one at a time as they arrive.
+	# After all of them, rest is the rest of the response with the list left
+	# empty, which has things like the pageInfo of a connection.
+	__slots__ = ('parser', 'send', 'error', 'queue', 'task', 'rest', 'closed')
+
+	def __init__(self, parser, send, error=ValueError, max_queued=64):
+		# send(read) makes the request and awaits read(response). error is
+		# raised with the response if the list isn't in it.
+		self.parser = parser
+		self.send = send
+		self.error = error
+		# Reading the response waits while this many items haven't been used
+		self.queue = asyncio.Queue(maxsize=max_queued)
+		self.task = None
+		self.rest = None
+		self.closed = False
+
+	async def read(self, response):
+		async for chunk in response.content.iter_any():
+			for item in self.parser.feed(chunk):
+				await self.queue.put(item)
+
+	async def run(self):
+		try:
+			await self.send(self.read)
+		finally:
+			if not self.closed:
+				await self.queue.put(None)
+
+	def __aiter__(self):
+		return self
+
+	async def __anext__(self):
+		if self.closed:
+			raise StopAsyncIteration
+		if self.task is None:
+			self.task = asyncio.ensure_future(self.run())
+		item = await self.queue.get()
+		if item is not None:
+			return item
+		self.closed = True
+		# Raises whatever went wrong with the request
+		await self.task
+		self.rest = self.parser.finish()
+		if self.page is None:
+			raise self.error(self.rest)
+		raise StopAsyncIteration
+
+	@property
+	def page(self):
+		# The object that the list was in, or None if it isn't there
+		page = self.rest
+		for key in self.parser.path[1:-1]:
+			page = page.get(key) if isinstance(page, dict) else None
+		return page
+
+	def close(self):
+		self.closed = True
+		if self.task is not None and not self.task.done():
+			self.task.cancel()
+
+	def __del__(self):
+		try:
+			self.close()
+		except (AttributeError, RuntimeError):
+			pass
@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(timestamp):
+	# Repl.it timestamps look like 2020-08-27T12:34:56.789Z, which
+	# fromisoformat can parse a lot faster than strptime once the Z is
+	# replaced. The same authors show up over and over in feeds, so the
+	# results are memoized too.
+	if timestamp is None:
+		return None
+	if timestamp.endswith('Z'):
+		try:
+			return datetime.fromisoformat(timestamp[:-1] + '+00:00')
+		except ValueError:
+			pass
+	# Anything fromisoformat doesn't like, such as months without a
+	# leading zero
+	return datetime.strptime(
+		timestamp, '%Y-%m-%dT%H:%M:%S.%fZ'
+	).replace(tzinfo=timezone.utc)
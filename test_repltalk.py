@@ -1,18 +1,147 @@
 import unittest
 import repltalk
+from aiohttp import web
 import asyncio
 import datetime
+import io
+import json
+from unittest import mock
+
+from benchmarks import fixtures
+from benchmarks.server import FakeServer
+from repltalk.pagination import PageReader, watch_items
 
 # The following code is for unit tests,
 # please read README.md for documentation
 
 
+class BatchServer():
+	# A local /graphql that answers batched post queries. Posts with odd ids
+	# exist, and a request for a negative id fails as a whole.
+	def __init__(self):
+		self.requests = []
+		self.runner = None
+
+	async def handle(self, request):
+		body = await request.json()
+		variables = body['variables']
+		self.requests.append(variables)
+		ids = [variables[f'id{i}'] for i in range(len(variables))]
+		if any(post_id < 0 for post_id in ids):
+			return web.json_response({'data': None, 'errors': [{'message': 'bad id'}]})
+		return web.json_response({'data': {
+			f'_{i}': {'id': post_id, 'title': f'Post {post_id}'} if post_id % 2 else None
+			for i, post_id in enumerate(ids)
+		}})
+
+	async def __aenter__(self):
+		app = web.Application()
+		app.router.add_post('/graphql', self.handle)
+		self.runner = web.AppRunner(app)
+		await self.runner.setup()
+		site = web.TCPSite(self.runner, '127.0.0.1', 0)
+		await site.start()
+		self.base_url = repltalk.base_url
+		repltalk.base_url = 'http://127.0.0.1:%d' % site._server.sockets[0].getsockname()[1]
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb):
+		repltalk.base_url = self.base_url
+		await self.runner.cleanup()
+
+
+class PagedCommentsClient(repltalk.Client):
+	# Pages of 5 comments, counting down from 9000
+	__slots__ = ()
+
+	async def _get_all_comments(self, order='new', after=None):
+		start = int(after or 9000)
+		post = {'id': 1, 'url': '/talk/share/x/1', 'title': 'x', 'user': None}
+		return {
+			'items': [{'id': i, 'post': post} for i in range(start, start - 5, -1)],
+			'pageInfo': {'nextCursor': str(start - 5)}
+		}
+
+
+class StubRepliesClient(repltalk.Client):
+	# Two pages of comments whose replies only come as ids. Fetching a reply
+	# is slow for 11 and 111, so the first comment is the last one done, and
+	# reply 33 was deleted.
+	__slots__ = ('active', 'most_active')
+
+	pages = {
+		None: ([(1, [11, 12]), (2, [21])], 'next'),
+		'next': ([(3, [31, 32, 33])], None),
+	}
+	replies = {11: [111], 12: [], 21: [], 31: [], 32: [], 111: []}
+
+	def __init__(self):
+		super().__init__()
+		self.active = 0
+		self.most_active = 0
+
+	def make_comment(self, comment_id, replies):
+		return {
+			'id': comment_id, 'body': f'Comment {comment_id}', 'canEdit': False,
+			'canComment': True, 'canReport': True, 'hasReported': False,
+			'url': f'/talk/share/x/1/{comment_id}', 'voteCount': 0,
+			'canVote': True, 'hasVoted': False, 'user': None,
+			'comments': [{'id': reply_id} for reply_id in replies]
+		}
+
+	async def track(self, seconds):
+		self.active += 1
+		self.most_active = max(self.most_active, self.active)
+		try:
+			await asyncio.sleep(seconds)
+		finally:
+			self.active -= 1
+
+	async def _get_comments(self, post_id, order='new', after=None):
+		await self.track(0.001)
+		comments, next_cursor = self.pages[after]
+		return {'comments': {
+			'items': [self.make_comment(*comment) for comment in comments],
+			'pageInfo': {'nextCursor': next_cursor}
+		}}
+
+	async def _get_comment(self, id):
+		await self.track(0.02 if id in (11, 111) else 0.001)
+		if id not in self.replies:
+			return None
+		return self.make_comment(id, self.replies[id])
+
+
+class TwoBoardsClient(repltalk.Client):
+	# Two boards in pages of 2 posts, both with post 2 in them
+	__slots__ = ()
+
+	votes = {
+		'share': [(1, 50), (2, 30), (3, 10)],
+		'ask': [(4, 40), (2, 30), (5, 20)],
+	}
+
+	async def _posts_in_board(
+		self, board_slugs=None, order='new', search_query=None, after=None,
+		fields=None
+	):
+		start = int(after or 0)
+		posts = self.votes[board_slugs[0]][start:start + 2]
+		return {
+			'items': [{'id': i, 'voteCount': votes} for i, votes in posts],
+			'pageInfo': {'nextCursor': str(start + 2)}
+		}
+
+
 class TestReplTalk(unittest.TestCase):
 	def setUp(self):
 		self.client = repltalk.Client()
 		self.loop = asyncio.get_event_loop()
 		self.run_async = self.loop.run_until_complete
 
+	def tearDown(self):
+		self.run_async(self.client.close())
+
 	async def async_test_board_posts(self):
 		async for post in self.client.boards.all.get_posts(sort='new', limit=1):
 			self.assertIsInstance(post.author, repltalk.User)
@@ -100,6 +229,262 @@ class TestReplTalk(unittest.TestCase):
 	def test_async_for_posts(self):
 		self.run_async(self.async_test_async_for_posts())
 
+	def test_compiled_query(self):
+		compiled = repltalk.graphql.compile_query(repltalk.Queries.get_post)
+		self.assertIs(compiled, repltalk.graphql.compile_query(repltalk.Queries.get_post))
+		self.assertEqual(compiled.document, str(repltalk.Queries.get_post))
+
+	def test_batch_query(self):
+		query = repltalk.Queries.batch_post_exists.query(2)
+		self.assertEqual(
+			str(query),
+			'query postBatch($id0:Int!,$id1:Int!){_0: post(id:$id0){id} _1: post(id:$id1){id}}'
+		)
+		self.assertIs(query, repltalk.Queries.batch_post_exists.query(2))
+
+	async def async_test_batcher(self):
+		async with BatchServer() as server:
+			async with self.client.batch():
+				exists = await asyncio.gather(*(
+					self.client.post_exists(post_id) for post_id in (1, 2, 1, 3)
+				))
+			self.assertEqual(exists, [True, False, True, True])
+			# The duplicate id shares an alias
+			self.assertEqual(server.requests[-1], {'id0': 1, 'id1': 2, 'id2': 3})
+			async with self.client.batch():
+				self.assertTrue(await self.client.post_exists(5))
+			self.assertEqual(server.requests[-1], {'id0': 5})
+			async with self.client.batch():
+				results = await asyncio.gather(
+					self.client.post_exists(-1), self.client.post_exists(7),
+					return_exceptions=True
+				)
+			for result in results:
+				self.assertIsInstance(result, repltalk.GraphqlError)
+
+	def test_batcher(self):
+		self.run_async(self.async_test_batcher())
+
+	async def async_test_iter_comments_stub_replies(self):
+		client = StubRepliesClient()
+		try:
+			post = repltalk.Post(client, {'id': 1, 'title': 'x'})
+			ids = []
+			async for comment in post.iter_comments(concurrency=2):
+				ids.append(comment.id)
+				if comment.id == 1:
+					self.assertEqual([r.content for r in comment.replies], [
+						'Comment 11', 'Comment 12'
+					])
+					self.assertEqual(comment.replies[0].replies[0].content, 'Comment 111')
+				if comment.id == 3:
+					self.assertEqual([r.content for r in comment.replies], [
+						'Comment 31', 'Comment 32', None
+					])
+			self.assertEqual(ids, [1, 2, 3])
+			self.assertEqual(client.most_active, 2)
+		finally:
+			await client.close()
+
+	def test_iter_comments_stub_replies(self):
+		self.run_async(self.async_test_iter_comments_stub_replies())
+
+	async def async_test_merged_posts(self):
+		client = TwoBoardsClient()
+		try:
+			posts = client.get_posts(boards=['share', 'ask'], merge=True)
+			self.assertIsInstance(posts, repltalk.MergedPostList)
+			self.assertEqual([post.id async for post in posts], [1, 4, 2, 5, 3])
+			async with client.get_posts(
+				boards=['share', 'ask'], merge=True, limit=3
+			) as posts:
+				self.assertEqual([post.id async for post in posts], [1, 4, 2])
+			columns = await client.get_posts(
+				boards=['share', 'ask'], merge=True
+			).to_columns()
+			self.assertEqual(list(columns['votes']), [50, 40, 30, 20, 10])
+			with self.assertRaises(ValueError):
+				client.get_posts(boards=['share'], merge=True, after='2')
+		finally:
+			await client.close()
+
+	def test_merged_posts(self):
+		self.run_async(self.async_test_merged_posts())
+
+	async def async_test_get_posts_by_ids(self):
+		async with BatchServer() as server:
+			posts = await self.client.get_posts_by_ids(
+				[3, 2, 3, 1], chunk_size=2, fields=['title']
+			)
+			self.assertEqual(
+				[post and post.title for post in posts],
+				['Post 3', None, 'Post 3', 'Post 1']
+			)
+			self.assertEqual(len(server.requests), 2)
+			with self.assertRaises(repltalk.GraphqlError):
+				await self.client.get_posts_by_ids([1, -1], fields=['title'])
+
+	def test_get_posts_by_ids(self):
+		self.run_async(self.async_test_get_posts_by_ids())
+
+	def test_parse_timestamp(self):
+		utc = datetime.timezone.utc
+		self.assertEqual(
+			repltalk.timestamps.parse_timestamp('2020-08-27T12:34:56.789Z'),
+			datetime.datetime(2020, 8, 27, 12, 34, 56, 789000, tzinfo=utc)
+		)
+		self.assertEqual(
+			repltalk.timestamps.parse_timestamp('2000-1-01T01:01:00.000Z'),
+			datetime.datetime(2000, 1, 1, 1, 1, tzinfo=utc)
+		)
+
+	async def async_test_page_reader(self):
+		async def fetch(after):
+			after = after or 0
+			return list(range(after, after + 10)), after + 10
+		reader = repltalk.PageReader(fetch, prefetch=2, max_items=25)
+		pages = []
+		while True:
+			page = await reader.next_page()
+			if page is None:
+				break
+			pages.append(page)
+		self.assertEqual(len(pages), 3)
+		self.assertEqual(reader.after, 30)
+
+	def test_page_reader(self):
+		self.run_async(self.async_test_page_reader())
+
+	async def async_test_abandoned_post_list(self):
+		class FakeBoard():
+			async def _get_posts(self, sort, search, after, fields=None):
+				after = after or 0
+				items = [{'id': i, 'title': 'x'} for i in range(after, after + 10)]
+				return {'items': items, 'pageInfo': {'nextCursor': after + 10}}
+
+		posts = repltalk.AsyncPostList(self.client, FakeBoard(), limit=100, prefetch=2)
+		async for post in posts:
+			break
+		task = posts.reader.task
+		# Once nothing else refers to the list, it stops reading ahead
+		del posts
+		await asyncio.sleep(0)
+		self.assertTrue(task.done())
+
+	def test_abandoned_post_list(self):
+		self.run_async(self.async_test_abandoned_post_list())
+
+	async def async_test_watch_items(self):
+		def page(*ids):
+			return [{'id': i} for i in ids]
+		# The pages every poll gets, newest first
+		polls = iter([
+			[],
+			[page(3, 2), page(1)],
+			[[{'id': 1, 'isPinned': True}] + page(5, 4), page(3, 2)],
+			[page(10, 9), page(8, 7), page(6)],
+			[page(10, 9), page(8, 7)],
+			[page(11, 10)],
+		])
+		pages_read = []
+
+		def read_pages():
+			pages = next(polls)
+			pages_read.append(0)
+
+			async def fetch(after):
+				i = after or 0
+				pages_read[-1] += 1
+				return (pages[i] if i < len(pages) else []), i + 1
+			return PageReader(fetch)
+
+		intervals = []
+
+		async def sleep(interval):
+			intervals.append(interval)
+
+		watch = watch_items(read_pages, max_pages=2)
+		with mock.patch('asyncio.sleep', sleep):
+			ids = [int((await watch.__anext__())['id']) for _ in range(10)]
+		await watch.aclose()
+		# Nothing existed at first, so everything after it is new. The pinned
+		# post doesn't stop the third poll, but no more than 2 pages are read.
+		self.assertEqual(ids, [1, 2, 3, 4, 5, 7, 8, 9, 10, 11])
+		self.assertEqual(pages_read, [1, 2, 2, 2, 1, 1])
+		self.assertEqual(intervals, [15, 7.5, 3.75, 2, 3])
+
+		client = PagedCommentsClient()
+		try:
+			watch = client.watch_comments(include_existing=True)
+			self.assertEqual((await watch.__anext__()).id, 8996)
+			await watch.aclose()
+		finally:
+			await client.close()
+
+	def test_watch_items(self):
+		self.run_async(self.async_test_watch_items())
+
+	def test_rate_limiter_mutations(self):
+		rate_limiter = repltalk.RateLimiter(rate=4, burst=1)
+		for _ in range(8):
+			rate_limiter.bucket.reserve()
+		# A mutation doesn't wait behind the 2 seconds of reads
+		self.assertEqual(self.run_async(rate_limiter.acquire('deletePost', True)), 0)
+		# but the reads after it do wait for the token it took
+		self.assertGreater(rate_limiter.bucket.reserve(), 2)
+
+	async def async_test_scheduler(self, scheduler):
+		async with scheduler.slot('query'):
+			waiting_query = asyncio.ensure_future(self.use_slot(scheduler, 'query'))
+			await asyncio.sleep(0)
+			self.assertEqual(scheduler.waiting['query'], 1)
+			# A mutation has its own lane, so it doesn't wait behind queries
+			await asyncio.wait_for(self.use_slot(scheduler, 'mutation'), 1)
+			self.assertFalse(waiting_query.done())
+		await waiting_query
+		self.assertGreater(scheduler.wait_time['query'], 0)
+		self.assertEqual(scheduler.wait_time['mutation'], 0)
+		self.assertEqual(scheduler.waiting, {'query': 0, 'mutation': 0})
+
+	async def use_slot(self, scheduler, operation):
+		async with scheduler.slot(operation):
+			pass
+
+	def test_scheduler(self):
+		scheduler = repltalk.Scheduler(queries=1, mutations=1)
+		self.run_async(self.async_test_scheduler(scheduler))
+		# The same scheduler still works from another event loop
+		loop = asyncio.new_event_loop()
+		try:
+			loop.run_until_complete(self.async_test_scheduler(scheduler))
+		finally:
+			loop.close()
+
+	def test_session_across_event_loops(self):
+		client = repltalk.Client()
+
+		async def get_session():
+			return client._get_session()
+		loops = [asyncio.new_event_loop(), asyncio.new_event_loop()]
+		try:
+			first = loops[0].run_until_complete(get_session())
+			self.assertIs(loops[0].run_until_complete(get_session()), first)
+			# Without close, another loop still gets a session that works in it
+			second = loops[1].run_until_complete(get_session())
+			self.assertIsNot(first, second)
+			loops[1].run_until_complete(client.close())
+			self.assertIsNone(client.session)
+			loops[0].run_until_complete(first.close())
+		finally:
+			for loop in loops:
+				loop.close()
+
+	def test_retry_delay(self):
+		retry_policy = repltalk.RetryPolicy(backoff=1, max_backoff=4)
+		self.assertEqual(retry_policy.delay(0, '2'), 2)
+		for attempt in range(5):
+			self.assertLessEqual(retry_policy.delay(attempt), 4)
+
 	def make_example_user(self, override={}):
 		data = {
 			'id': '747811',
@@ -121,6 +506,219 @@ class TestReplTalk(unittest.TestCase):
 		data.update(override)
 		return repltalk.User(self.client, data)
 
+	def test_identity_map(self):
+		self.client.identity_map = repltalk.IdentityMap(max_size=2)
+		user = self.make_example_user().data
+		first = repltalk.get_user_object(self.client, user)
+		second = repltalk.get_user_object(self.client, dict(user, karma=2000))
+		self.assertIs(first, second)
+		self.assertEqual(first.cycles, 2000)
+
+	def test_identity_map_partial_data(self):
+		self.client.identity_map = repltalk.IdentityMap()
+		post = repltalk.Post(self.client, {'id': 5, 'title': 'Hi'})
+
+		def comment(comment_id, replies=()):
+			return {
+				'id': comment_id, 'body': f'comment {comment_id}', 'voteCount': 0,
+				'url': f'/talk/c/{comment_id}', 'canEdit': False, 'canComment': True,
+				'canReport': True, 'hasReported': False, 'canVote': True,
+				'hasVoted': False, 'comments': list(replies)
+			}
+		child = repltalk.get_comment_object(self.client, comment(2), post)
+		# The reply in the parent only has its id, which shouldn't replace the
+		# rest of what's known about it
+		parent = repltalk.get_comment_object(self.client, comment(1, [{'id': 2}]), post)
+		self.assertIs(parent.replies[0], child)
+		self.assertEqual(child.content, 'comment 2')
+		self.assertIs(child.parent, parent)
+		# And a post that's only an id doesn't replace the whole post
+		repltalk.get_comment_object(self.client, comment(2), post.id)
+		self.assertIs(child.post, post)
+
+	def test_response_cache(self):
+		cache = repltalk.ResponseCache()
+		cache.set('post', 'hash', {'id': 1}, {'id': 1})
+		cache.set('post', 'hash', {'id': 2}, {'id': 2})
+		self.assertEqual(cache.get('post', 'hash', {'id': 1}), {'id': 1})
+		cache.mutated('deletePost', {'id': 1})
+		self.assertIsNone(cache.get('post', 'hash', {'id': 1}))
+		self.assertEqual(cache.get('post', 'hash', {'id': 2}), {'id': 2})
+		self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+	async def async_test_response_cache_requests(self):
+		base_url = repltalk.base_url
+		self.client.response_cache = cache = repltalk.ResponseCache()
+		async with FakeServer({
+			'post': {'data': {'post': None}},
+			'userByUsername': {'data': {'userByUsername': {'id': 1}}},
+		}) as server:
+			repltalk.base_url = server.url
+			try:
+				# Posts that don't exist aren't cached, and don't count as hits
+				for _ in range(3):
+					self.assertFalse(await self.client.post_exists(42))
+				self.assertEqual(server.requests, 3)
+				self.assertEqual((cache.hits, cache.misses), (0, 3))
+				query = repltalk.Queries.get_user
+				user = await self.client.perform_graphql('userByUsername', query, username='a')
+				self.assertEqual(user, {'id': 1})
+				# The full response isn't mixed up with just its data
+				response = await self.client.perform_graphql(
+					'userByUsername', query, full_response=True, username='a'
+				)
+				self.assertEqual(response, {'data': {'userByUsername': {'id': 1}}})
+				self.assertEqual(server.requests, 5)
+			finally:
+				repltalk.base_url = base_url
+
+	def test_response_cache_requests(self):
+		self.run_async(self.async_test_response_cache_requests())
+
+	def test_post_fields(self):
+		queries = repltalk.queries.post_queries(['title', 'voteCount'])
+		self.assertIs(queries, repltalk.queries.post_queries(['voteCount', 'title']))
+		self.assertEqual(
+			str(queries.get_post),
+			'query post($id:Int!){post(id:$id){id title voteCount}}'
+		)
+		post = repltalk.Post(self.client, {'id': 1, 'title': 'Hi', 'voteCount': 3})
+		self.assertEqual((post.title, post.votes), ('Hi', 3))
+		with self.assertRaises(repltalk.NotFetched):
+			post.author
+
+	def test_profile_posts_query(self):
+		# The posts' comments would otherwise use the cursor of the posts
+		document = str(repltalk.Queries.get_user_posts)
+		self.assertIn('posts(order:$order,after:$after,count:$count)', document)
+		self.assertNotIn('comments(', document)
+
+	def test_metrics_collector(self):
+		metrics = repltalk.MetricsCollector()
+		self.client.instrumentation = metrics
+		for seconds in (0.001, 0.002, 0.5):
+			metrics.phase('post', 'render', seconds)
+		metrics.response('post', 200, 100, 2000)
+		metrics.error('post', repltalk.GraphqlError())
+		repltalk.get_user_object(self.client, self.make_example_user().data)
+		exported = metrics.export()
+		self.assertEqual(exported['post']['calls'], 3)
+		self.assertEqual(exported['post']['response_bytes'], 2000)
+		self.assertAlmostEqual(exported['post']['error_rate'], 1 / 3)
+		self.assertEqual(exported['post']['phases']['render']['max'], 0.5)
+		self.assertEqual(exported['User']['phases']['construct']['count'], 1)
+
+	async def async_test_metrics_cached_and_streamed(self):
+		base_url = repltalk.base_url
+		metrics = repltalk.MetricsCollector()
+		self.client.instrumentation = metrics
+		self.client.response_cache = repltalk.ResponseCache()
+		async with FakeServer({
+			'userByUsername': {'data': {'userByUsername': {'id': 1}}},
+			'ReplPostsFeed': fixtures.responses()['ReplPostsFeed'],
+		}) as server:
+			repltalk.base_url = server.url
+			try:
+				for _ in range(2):
+					await self.client.perform_graphql(
+						'userByUsername', repltalk.Queries.get_user, username='a'
+					)
+				async for _ in self.client._stream_posts_in_board(order='new'):
+					pass
+				with self.assertRaises(repltalk.GraphqlError):
+					async for _ in self.client.stream_graphql(
+						'missing', repltalk.Queries.get_user, ('data', 'x', 'items')
+					):
+						pass
+			finally:
+				repltalk.base_url = base_url
+		exported = metrics.export()
+		# The second call was answered by the cache
+		user = exported['userByUsername']
+		self.assertEqual((user['calls'], user['requests']), (2, 1))
+		self.assertEqual(user['phases']['cache']['count'], 1)
+		feed = exported['ReplPostsFeed']
+		self.assertEqual((feed['calls'], feed['requests'], feed['errors']), (1, 1, 0))
+		self.assertEqual(feed['phases']['wire']['count'], 1)
+		missing = exported['missing']
+		self.assertEqual((missing['calls'], missing['errors']), (1, 1))
+
+	def test_metrics_cached_and_streamed(self):
+		self.run_async(self.async_test_metrics_cached_and_streamed())
+
+	def test_item_parser(self):
+		body = (
+			b'{"data": {"replPosts": {"pageInfo": {"nextCursor": "2"}, '
+			b'"items": [{"id": 1, "title": "a [\\"}"}, {"id": 2, "tags": []}]}}}'
+		)
+		# However the response is split up, the same items come out of it
+		for size in (1, 7, len(body)):
+			parser = repltalk.ItemParser(('data', 'replPosts', 'items'), json.loads)
+			items = []
+			for i in range(0, len(body), size):
+				items += parser.feed(body[i:i + size])
+			self.assertEqual(items, [{'id': 1, 'title': 'a ["}'}, {'id': 2, 'tags': []}])
+			rest = parser.finish()
+			self.assertEqual(rest['data']['replPosts']['items'], [])
+			self.assertEqual(rest['data']['replPosts']['pageInfo']['nextCursor'], '2')
+
+	def test_lazy_post_deleted_author(self):
+		post = repltalk.LazyPost(self.client, {
+			'id': 1, 'url': '/talk/share/x/1', 'title': 'Hi', 'user': None
+		})
+		self.assertIsNone(post.author)
+		self.assertEqual(post.title, 'Hi')
+
+	async def async_test_comments_resume(self):
+		client = PagedCommentsClient()
+		try:
+			comments = client.get_all_comments(limit=3, prefetch=1)
+			first = [c.id async for c in comments]
+			rest = client.get_all_comments(limit=4, after=comments.after)
+			second = [c.id async for c in rest]
+			third = await client.get_all_comments(after=rest.after)
+		finally:
+			await client.close()
+		self.assertEqual(first, [9000, 8999, 8998])
+		self.assertEqual(second, [8997, 8996, 8995, 8994])
+		self.assertEqual(third[0].id, 8993)
+
+	def test_comments_resume(self):
+		self.run_async(self.async_test_comments_resume())
+
+	async def async_test_stream_pages(self):
+		base_url = repltalk.base_url
+		async with FakeServer(fixtures.responses()) as server:
+			repltalk.base_url = server.url
+			try:
+				for stream in (False, True):
+					posts = self.client.get_posts(limit=70, sort='new', stream=stream)
+					for _ in range(5):
+						await posts.__anext__()
+					# The rest of the first page, then whole pages of 30
+					pages = [len(page) async for page in posts.pages()]
+					self.assertEqual(pages, [25, 30, 10])
+			finally:
+				repltalk.base_url = base_url
+
+	def test_stream_pages(self):
+		self.run_async(self.async_test_stream_pages())
+
+	def test_columns(self):
+		columns = repltalk.Columns(repltalk.export.post_columns)
+		columns.extend([
+			{'id': '5', 'voteCount': 2, 'timeCreated': '1970-01-01T00:00:01.500Z', 'user': {'id': 9}},
+			{'id': '6', 'voteCount': 0, 'user': None},
+		])
+		self.assertEqual(list(columns['id']), [5, 6])
+		self.assertEqual(list(columns['time_created']), [1500, -1])
+		self.assertEqual(list(columns['author_id']), [9, -1])
+		file = io.BytesIO()
+		columns.write(file)
+		file.seek(0)
+		read = repltalk.read_columns(file)
+		self.assertEqual({n: list(read[n]) for n in read}, {n: list(columns[n]) for n in columns})
+
 	def make_example_board(self, rich=True):
 		return repltalk.RichBoard(self.client, {
 			'id': 14,